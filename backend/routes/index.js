@@ -89,7 +89,7 @@ router.post('/pronunciation/breakdown', async (req, res) => {
     if (!body.word) {
       return res.json({ message: "word is missing" })
     }
-    const response = await axios.get(`http://localhost:8000/breakdown?word=${body.word}`)
+    const response = await axios.get(`http://localhost:8000/breakdown?word=${body.word}&inline_audio=true`)
     return res.json({ message: "success", data: response.data })
   } catch (error) {
     console.log("error in pronunciation breakdown", error.message)
@@ -100,7 +100,7 @@ router.post('/pronunciation/breakdown', async (req, res) => {
 // Get random words of the day
 router.get('/pronunciation/random', async (req, res) => {
   try {
-    const response = await axios.get("http://localhost:8000/random-words")
+    const response = await axios.get("http://localhost:8000/random-words?inline_audio=true")
     return res.json({ message: "success", data: response.data });
   } catch (error) {
     console.log("error getting random words", error.message);
@@ -0,0 +1,89 @@
+"""
+Audio Transport Encoding
+Vectorized conversion of 16-bit PCM microphone frames for the STT WebSocket.
+
+Supported transports (AssemblyAI `encoding` values):
+- "pcm_s16le": 16-bit PCM, unchanged (32 KB/s at 16 kHz)
+- "pcm_mulaw": 8-bit G.711 mu-law (16 KB/s at 16 kHz, 8 KB/s at 8 kHz)
+
+Either can be combined with integer-factor downsampling (e.g. 16 kHz -> 8 kHz).
+"""
+
+import numpy as np
+
+ENCODINGS = ("pcm_s16le", "pcm_mulaw")
+
+_MULAW_BIAS = 0x84
+
+
+def _build_mulaw_table() -> np.ndarray:
+    """
+    G.711 mu-law code for every int16 value, indexed by the value's uint16 bit pattern
+    (same output as the reference g711.c / audioop.lin2ulaw).
+    """
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(samples < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(samples), 8159) + (_MULAW_BIAS >> 2)
+    segment = np.searchsorted(np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF]), magnitude)
+    codes = (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F)
+    codes = np.where(segment >= 8, 0x7F, codes)  # out of range: clip to the largest code
+    return (codes ^ mask).astype(np.uint8)
+
+
+def _build_mulaw_decode_table() -> np.ndarray:
+    codes = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = (((mantissa << 3) + _MULAW_BIAS) << exponent) - _MULAW_BIAS
+    return np.where(codes & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+# Encoding is a single table lookup per sample
+_MULAW_ENCODE = _build_mulaw_table()
+_MULAW_DECODE = _build_mulaw_decode_table()
+
+
+def mulaw_encode(samples: np.ndarray) -> np.ndarray:
+    return _MULAW_ENCODE[samples.view(np.uint16)]
+
+
+def mulaw_decode(codes: np.ndarray) -> np.ndarray:
+    return _MULAW_DECODE[codes]
+
+
+def downsample(samples: np.ndarray, factor: int) -> np.ndarray:
+    """Decimate by `factor`, averaging each group of samples as a simple low-pass filter."""
+    if factor == 1:
+        return samples
+    usable = len(samples) - len(samples) % factor
+    # Strided slices instead of reshape(-1, factor).sum(axis=1), which is slow for short rows
+    total = samples[0:usable:factor].astype(np.int32)
+    for offset in range(1, factor):
+        total += samples[offset:usable:factor]
+    return (total // factor).astype(np.int16)
+
+
+class TransportEncoder:
+    def __init__(self, input_rate: int = 16000, encoding: str = "pcm_s16le", sample_rate: int = None):
+        sample_rate = sample_rate or input_rate
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unsupported encoding: {encoding}. Use one of {', '.join(ENCODINGS)}")
+        if input_rate % sample_rate:
+            raise ValueError(f"Sample rate {sample_rate} must divide the capture rate {input_rate}")
+        
+        self.encoding = encoding
+        self.sample_rate = sample_rate
+        self.factor = input_rate // sample_rate
+        self.passthrough = encoding == "pcm_s16le" and self.factor == 1
+    
+    def connection_params(self) -> dict:
+        """Settings the STT service needs to decode what encode() produces."""
+        return {"sample_rate": self.sample_rate, "encoding": self.encoding}
+    
+    def encode(self, pcm: bytes) -> bytes:
+        if self.passthrough:
+            return pcm
+        samples = downsample(np.frombuffer(pcm, dtype=np.int16), self.factor)
+        if self.encoding == "pcm_mulaw":
+            return mulaw_encode(samples).tobytes()
+        return samples.tobytes()
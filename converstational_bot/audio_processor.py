@@ -8,22 +8,51 @@ import websocket
 import json
 import threading
 import time
-import wave
 import requests
 import os
 import re
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Callable, List
+from typing import Optional, Callable, Iterable, List
 from murf import Murf
+from vad import EnergyVAD
+from wav_recorder import StreamingWavRecorder
+from audio_codec import TransportEncoder
+
+# Sentence boundary: terminal punctuation (optionally followed by a closing quote) and whitespace
+SENTENCE_END_RE = re.compile(r'(?<=[.!?])["\')\]]?\s+')
+# Shorter sentences are merged with the next one to avoid many tiny TTS requests
+MIN_SENTENCE_CHARS = 20
+
+
+def split_complete_sentences(buffer: str):
+    """Split off the complete sentences at the start of `buffer`; returns (sentences, remainder)."""
+    sentences = []
+    start = 0
+    for match in SENTENCE_END_RE.finditer(buffer):
+        sentence = buffer[start:match.end()].strip()
+        if len(sentence) >= MIN_SENTENCE_CHARS:
+            sentences.append(sentence)
+            start = match.end()
+    return sentences, buffer[start:]
+
 
 class AudioProcessor:
-    def __init__(self):
+    def __init__(self, stt_encoding: str = "pcm_s16le", stt_sample_rate: int = 16000):
+        """
+        `stt_encoding` / `stt_sample_rate` choose how microphone audio travels to the STT
+        service: "pcm_s16le" at 16 kHz is 32 KB/s, "pcm_mulaw" at 8 kHz is 8 KB/s.
+        """
+        # Audio sent to STT is re-encoded from the 16 kHz capture format (see audio_codec.py)
+        self.transport_encoder = TransportEncoder(16000, stt_encoding, stt_sample_rate)
+        
         # STT Configuration (AssemblyAI)
         self.stt_api_key = "0a5659ce096b4d2b9f488f9f4ecff57b"
         self.stt_connection_params = {
-            "sample_rate": 16000,
+            **self.transport_encoder.connection_params(),
             "format_turns": True
         }
         self.stt_api_endpoint = f"wss://streaming.assemblyai.com/v3/ws?{urlencode(self.stt_connection_params)}"
@@ -39,6 +68,12 @@ class AudioProcessor:
         self.channels = 1
         self.format = pyaudio.paInt16
         
+        # Voice activity detection: silent frames are not sent, and a local endpoint
+        # (ForceEndpoint) ends the turn after this much silence following speech
+        self.use_vad = True
+        self.vad_endpoint_ms = 800
+        self.vad = EnergyVAD(self.sample_rate, self.frames_per_buffer, endpoint_ms=self.vad_endpoint_ms)
+        
         # State variables
         self.audio = None
         self.stream = None
@@ -48,93 +83,194 @@ class AudioProcessor:
         self.is_listening = False
         self.current_transcript = ""
         self.transcript_callback = None
+        self.partial_transcript_callback = None
         self.pronunciation_errors = []
         
-        # Recording variables
-        self.recorded_frames = []
+        # STT session state: one WebSocket + mic stream serves every turn of a conversation
+        self.session_lock = threading.Lock()
+        self.session_ready = threading.Event()       # set on the "Begin" message
+        self.session_terminated = threading.Event()  # set on "Termination" or socket close
+        self.session_timeout = 10  # seconds to wait for Begin / Termination
+        
+        # Recording variables: frames are streamed to a WAV file, never kept in memory
+        self.recorder = None
         self.recording_lock = threading.Lock()
         
-    def start_listening(self, callback: Callable[[str, List[str]], None]):
-        """Start listening for speech input."""
+    def start_listening(self, callback: Callable[[str, List[str]], None],
+                        partial_callback: Optional[Callable[[str], None]] = None):
+        """
+        Start listening for one turn of speech input. `callback` gets the final formatted
+        transcript; the optional `partial_callback` gets every unformatted partial transcript.
+        
+        The STT session is opened on the first call and reused for later turns; between
+        turns the microphone audio is simply not sent.
+        """
         if self.is_listening:
             print("Already listening...")
             return
         
+        if not self._ensure_session():
+            return
+        
         self.transcript_callback = callback
-        self.is_listening = True
-        self.stop_event.clear()
+        self.partial_transcript_callback = partial_callback
         self.current_transcript = ""
         self.pronunciation_errors = []
         
-        # Initialize PyAudio
-        self.audio = pyaudio.PyAudio()
-        
-        try:
-            # Open microphone stream
-            self.stream = self.audio.open(
-                input=True,
-                frames_per_buffer=self.frames_per_buffer,
-                channels=self.channels,
-                format=self.format,
-                rate=self.sample_rate,
-            )
-            print("Listening... Speak now!")
-            
-            # Create WebSocket connection
-            self.ws_app = websocket.WebSocketApp(
-                self.stt_api_endpoint,
-                header={"Authorization": self.stt_api_key},
-                on_open=self._on_stt_open,
-                on_message=self._on_stt_message,
-                on_error=self._on_stt_error,
-                on_close=self._on_stt_close,
-            )
-            
-            # Start WebSocket in separate thread
-            ws_thread = threading.Thread(target=self.ws_app.run_forever)
-            ws_thread.daemon = True
-            ws_thread.start()
-            
-        except Exception as e:
-            print(f"Error starting audio input: {e}")
-            self.stop_listening()
+        # Open the gate: the audio thread starts sending microphone frames
+        self.vad.reset()
+        self.is_listening = True
+        print("Listening... Speak now!")
     
     def stop_listening(self):
-        """Stop listening for speech input."""
-        if not self.is_listening:
-            return
-        
+        """Stop listening for the current turn; the STT session stays open for the next one."""
         self.is_listening = False
-        self.stop_event.set()
-        
-        # Send termination message
-        if self.ws_app and self.ws_app.sock and self.ws_app.sock.connected:
+    
+    def _ensure_session(self) -> bool:
+        """Open the microphone stream and STT WebSocket unless they are already running."""
+        with self.session_lock:
+            if self.ws_app and not self.session_terminated.is_set():
+                return True
+            
+            # Release whatever is left of a session the server closed
+            self._teardown_session()
+            self.stop_event.clear()
+            self.session_ready.clear()
+            self.session_terminated.clear()
+            
             try:
-                terminate_message = {"type": "Terminate"}
-                self.ws_app.send(json.dumps(terminate_message))
-                time.sleep(1)  # Give time for final transcript
+                # Initialize PyAudio and open the microphone stream
+                self.audio = pyaudio.PyAudio()
+                self.stream = self.audio.open(
+                    input=True,
+                    frames_per_buffer=self.frames_per_buffer,
+                    channels=self.channels,
+                    format=self.format,
+                    rate=self.sample_rate,
+                )
+                
+                # Create WebSocket connection
+                self.ws_app = websocket.WebSocketApp(
+                    self.stt_api_endpoint,
+                    header={"Authorization": self.stt_api_key},
+                    on_open=self._on_stt_open,
+                    on_message=self._on_stt_message,
+                    on_error=self._on_stt_error,
+                    on_close=self._on_stt_close,
+                )
+                
+                # Start WebSocket in separate thread
+                ws_thread = threading.Thread(target=self.ws_app.run_forever)
+                ws_thread.daemon = True
+                ws_thread.start()
+                
             except Exception as e:
-                print(f"Error sending termination: {e}")
+                print(f"Error starting audio input: {e}")
+                self._teardown_session()
+                return False
+        
+        if not self.session_ready.wait(timeout=self.session_timeout):
+            print("Timed out waiting for the STT session to begin")
+            self.close_session()
+            return False
+        return True
+    
+    def close_session(self):
+        """End the STT session: send Terminate, wait for the Termination message, release the mic."""
+        self.is_listening = False
+        
+        with self.session_lock:
+            if self.ws_app and self.ws_app.sock and self.ws_app.sock.connected:
+                try:
+                    terminate_message = {"type": "Terminate"}
+                    self.ws_app.send(json.dumps(terminate_message))
+                    # The final transcript and Termination arrive before the server closes
+                    if not self.session_terminated.wait(timeout=self.session_timeout):
+                        print("Timed out waiting for STT termination")
+                except Exception as e:
+                    print(f"Error sending termination: {e}")
+            
+            self._teardown_session()
+        
+        print("Stopped listening")
+    
+    def _teardown_session(self):
+        self.stop_event.set()
         
         # Close WebSocket
         if self.ws_app:
             self.ws_app.close()
+            self.ws_app = None
+        
+        if self.audio_thread and self.audio_thread.is_alive() and self.audio_thread is not threading.current_thread():
+            self.audio_thread.join(timeout=1.0)
+        self.audio_thread = None
         
+        self._close_audio_device()
+    
+    def _close_audio_device(self):
         # Clean up audio resources
-        if self.stream and self.stream.is_active():
-            self.stream.stop_stream()
         if self.stream:
+            if self.stream.is_active():
+                self.stream.stop_stream()
             self.stream.close()
+            self.stream = None
         if self.audio:
             self.audio.terminate()
-        
-        print("Stopped listening")
+            self.audio = None
     
     def speak_text(self, text: str) -> str:
         """Convert text to speech and return the audio file path."""
+        print(f"Speaking: {text}")
+        output_path = self.synthesize_speech(text)
+        if output_path:
+            # Play the audio (you might want to use pygame or similar for better audio playback)
+            self._play_audio_file(output_path)
+        return output_path
+    
+    def speak_stream(self, text_chunks: Iterable[str], max_parallel: int = 3) -> List[str]:
+        """
+        Speak a reply while it is still being generated.
+        
+        Complete sentences are cut from the incoming chunks and synthesized concurrently
+        as soon as they are available; a player thread plays them back strictly in order.
+        Returns the audio file paths in playback order.
+        """
+        pending = queue.Queue()
+        paths = []
+        
+        def play_in_order():
+            while True:
+                future = pending.get()
+                if future is None:
+                    break
+                path = future.result()
+                if path:
+                    paths.append(path)
+                    self._play_audio_file(path, wait=True)
+        
+        player = threading.Thread(target=play_in_order, daemon=True)
+        player.start()
+        
+        with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="tts") as executor:
+            buffer = ""
+            try:
+                for chunk in text_chunks:
+                    buffer += chunk
+                    sentences, buffer = split_complete_sentences(buffer)
+                    for sentence in sentences:
+                        pending.put(executor.submit(self.synthesize_speech, sentence))
+                if buffer.strip():
+                    pending.put(executor.submit(self.synthesize_speech, buffer.strip()))
+            finally:
+                pending.put(None)
+                player.join()
+        
+        return paths
+    
+    def synthesize_speech(self, text: str) -> Optional[str]:
+        """Synthesize `text` with Murf and return the saved MP3 path (None on failure)."""
         try:
-            print(f"Speaking: {text}")
-            
             # Generate speech using Murf TTS
             audio_response = self.tts_client.text_to_speech.generate(
                 format="MP3",
@@ -143,8 +279,8 @@ class AudioProcessor:
                 voice_id="en-US-natalie",
             )
             
-            # Create output filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Create output filename (microseconds: several sentences can finish within a second)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
             output_filename = f"bot_response_{timestamp}.mp3"
             output_path = Path(__file__).parent / output_filename
             
@@ -160,17 +296,29 @@ class AudioProcessor:
                 with open(output_path, 'wb') as audio_file:
                     audio_file.write(audio_response.audio_file)
             
-            # Play the audio (you might want to use pygame or similar for better audio playback)
-            self._play_audio_file(str(output_path))
-            
             return str(output_path)
             
         except Exception as e:
             print(f"Error generating speech: {e}")
             return None
     
-    def _play_audio_file(self, file_path: str):
-        """Play an audio file. This is a simple implementation."""
+    def _play_audio_file(self, file_path: str, wait: bool = False):
+        """Play an audio file. With `wait`, block until playback ends (needs pygame)."""
+        if wait:
+            try:
+                import pygame
+                if not pygame.mixer.get_init():
+                    pygame.mixer.init()
+                pygame.mixer.music.load(file_path)
+                pygame.mixer.music.play()
+                while pygame.mixer.music.get_busy():
+                    time.sleep(0.05)
+                return
+            except ImportError:
+                pass  # Fall back to the system player; clips may then overlap
+            except Exception as e:
+                print(f"Error playing audio: {e}")
+                return
         try:
             # For Windows, use the default audio player
             if os.name == 'nt':
@@ -187,16 +335,24 @@ class AudioProcessor:
         print("STT connection established")
         
         def stream_audio():
-            while not self.stop_event.is_set() and self.is_listening:
+            # Runs for the whole session; the mic is read continuously so no stale audio
+            # builds up in the device buffer, but frames are only sent during a turn
+            while not self.stop_event.is_set():
                 try:
                     audio_data = self.stream.read(self.frames_per_buffer, exception_on_overflow=False)
+                    if not self.is_listening:
+                        continue
                     
                     # Store for recording
-                    with self.recording_lock:
-                        self.recorded_frames.append(audio_data)
+                    self._record_frame(audio_data)
                     
-                    # Send to STT service
-                    ws.send(audio_data, websocket.ABNF.OPCODE_BINARY)
+                    # Send only speech (plus pre-roll / hangover) to the STT service
+                    frames_to_send, endpoint = self.vad.process(audio_data) if self.use_vad else ([audio_data], False)
+                    for frame in frames_to_send:
+                        ws.send(self.transport_encoder.encode(frame), websocket.ABNF.OPCODE_BINARY)
+                    if endpoint:
+                        # The user has stopped talking: have the server finalize the turn now
+                        ws.send(json.dumps({"type": "ForceEndpoint"}))
                 except Exception as e:
                     print(f"Error streaming audio: {e}")
                     break
@@ -211,11 +367,22 @@ class AudioProcessor:
             data = json.loads(message)
             msg_type = data.get('type')
             
-            if msg_type == "Turn":
+            if msg_type == "Begin":
+                self.session_ready.set()
+            
+            elif msg_type == "Termination":
+                self.session_terminated.set()
+            
+            elif msg_type == "Turn":
                 transcript = data.get('transcript', '')
                 formatted = data.get('turn_is_formatted', False)
                 
                 if formatted and transcript:
+                    if not self.is_listening:
+                        return  # Late result for a turn that was already abandoned
+                    
+                    # The turn is over: stop sending audio until the next start_listening
+                    self.is_listening = False
                     self.current_transcript = transcript
                     print(f"You said: {transcript}")
                     
@@ -225,6 +392,10 @@ class AudioProcessor:
                     # Call the callback with transcript and errors
                     if self.transcript_callback:
                         self.transcript_callback(transcript, errors)
+                
+                elif transcript and self.is_listening and self.partial_transcript_callback:
+                    # Partial transcript while the user is still speaking
+                    self.partial_transcript_callback(transcript)
                         
         except Exception as e:
             print(f"Error handling STT message: {e}")
@@ -233,11 +404,14 @@ class AudioProcessor:
         """Handle STT WebSocket errors."""
         print(f"STT Error: {error}")
         self.stop_event.set()
+        self.session_terminated.set()
     
     def _on_stt_close(self, ws, close_status_code, close_msg):
         """Handle STT WebSocket connection close."""
         print(f"STT connection closed: {close_status_code}")
         self.stop_event.set()
+        # Unblocks close_session; the next start_listening opens a fresh session
+        self.session_terminated.set()
     
     def _analyze_pronunciation(self, transcript: str) -> List[str]:
         """Analyze transcript for potential pronunciation errors."""
@@ -281,27 +455,33 @@ class AudioProcessor:
         
         return errors
     
+    def _record_frame(self, audio_data: bytes):
+        with self.recording_lock:
+            if self.recorder is None:
+                # The file is created with the first recorded frame
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                self.recorder = StreamingWavRecorder(
+                    f"conversation_audio_{timestamp}.wav", self.channels, self.sample_rate
+                )
+            self.recorder.write(audio_data)
+    
     def save_conversation_audio(self, filename: str = None) -> str:
-        """Save the recorded conversation audio to a WAV file."""
-        if not self.recorded_frames:
+        """Finish the conversation recording and return its WAV file path."""
+        with self.recording_lock:
+            recorder, self.recorder = self.recorder, None
+        
+        if recorder is None:
             print("No audio data recorded.")
             return None
         
-        if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"conversation_audio_{timestamp}.wav"
-        
         try:
-            with wave.open(filename, 'wb') as wf:
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(2)  # 16-bit = 2 bytes
-                wf.setframerate(self.sample_rate)
-                
-                with self.recording_lock:
-                    wf.writeframes(b''.join(self.recorded_frames))
+            path = recorder.close()
+            if filename and filename != path:
+                os.replace(path, filename)
+                path = filename
             
-            print(f"Conversation audio saved to: {filename}")
-            return filename
+            print(f"Conversation audio saved to: {path}")
+            return path
             
         except Exception as e:
             print(f"Error saving audio file: {e}")
@@ -0,0 +1,82 @@
+"""
+Benchmark: STT transport encodings - encode CPU cost against bytes saved.
+
+Encodes a synthetic voiced signal in 50 ms microphone frames (800 samples at
+16 kHz) with each transport option of audio_codec.TransportEncoder and reports
+per-frame encode time, CPU share of real time, upstream bandwidth, and the
+SNR of the decoded signal against the original (resampled to the same rate).
+
+Usage:
+    python benchmark_audio_transport.py [--seconds 60]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from audio_codec import TransportEncoder, downsample, mulaw_decode
+
+CAPTURE_RATE = 16000
+FRAME_SAMPLES = 800
+TRANSPORTS = [("pcm_s16le", 16000), ("pcm_s16le", 8000), ("pcm_mulaw", 16000), ("pcm_mulaw", 8000)]
+
+
+def synthetic_voice(seconds, seed=0):
+    """Harmonic-rich 'vowel' with a wandering pitch and a little background noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * CAPTURE_RATE)) / CAPTURE_RATE
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / CAPTURE_RATE
+    signal = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = 0.5 + 0.5 * np.abs(np.sin(2 * np.pi * 1.5 * t))
+    samples = 6000 * envelope * signal + rng.normal(0, 100, len(t))
+    return np.clip(samples, -32768, 32767).astype(np.int16)
+
+
+def snr_db(reference, decoded):
+    noise = reference.astype(np.float64) - decoded.astype(np.float64)
+    noise_energy = np.sum(noise ** 2)
+    if not noise_energy:
+        return float("inf")  # lossless
+    return 10 * np.log10(np.sum(reference.astype(np.float64) ** 2) / noise_energy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60)
+    args = parser.parse_args()
+
+    samples = synthetic_voice(args.seconds)
+    frames = [samples[i:i + FRAME_SAMPLES].tobytes() for i in range(0, len(samples) - FRAME_SAMPLES + 1, FRAME_SAMPLES)]
+    audio_seconds = len(frames) * FRAME_SAMPLES / CAPTURE_RATE
+    baseline_rate = None
+
+    print(f"{len(frames)} frames ({audio_seconds:.0f} s of audio)\n")
+    print(f"{'transport':<18}{'us/frame':>10}{'CPU %':>8}{'KB/s':>8}{'saved':>8}{'SNR dB':>9}")
+    for encoding, rate in TRANSPORTS:
+        encoder = TransportEncoder(CAPTURE_RATE, encoding, rate)
+        start = time.perf_counter()
+        encoded = [encoder.encode(frame) for frame in frames]
+        elapsed = time.perf_counter() - start
+
+        sent_bytes = sum(len(chunk) for chunk in encoded)
+        payload = b"".join(encoded)
+        if encoding == "pcm_mulaw":
+            decoded = mulaw_decode(np.frombuffer(payload, dtype=np.uint8))
+        else:
+            decoded = np.frombuffer(payload, dtype=np.int16)
+        reference = downsample(samples[:len(frames) * FRAME_SAMPLES], encoder.factor)
+
+        bytes_per_second = sent_bytes / audio_seconds
+        baseline_rate = baseline_rate or bytes_per_second
+        print(f"{encoding + '@' + str(rate // 1000) + 'k':<18}"
+              f"{elapsed / len(frames) * 1e6:>10.1f}"
+              f"{elapsed / audio_seconds * 100:>8.3f}"
+              f"{bytes_per_second / 1024:>8.1f}"
+              f"{1 - bytes_per_second / baseline_rate:>8.0%}"
+              f"{snr_db(reference, decoded):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
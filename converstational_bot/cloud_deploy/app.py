@@ -3,9 +3,10 @@ Cloud Run Flask API for Conversational Bot
 Production-ready API for deployment on Google Cloud Run
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import os
+import json
 import sys
 
 # Import bot modules
@@ -44,6 +45,7 @@ def home():
         'endpoints': {
             'start_conversation': '/api/start_conversation',
             'generate_response': '/api/generate_response',
+            'generate_response_stream': '/api/generate_response/stream',
             'generate_report': '/api/generate_report',
             'health': '/api/health'
         }
@@ -136,6 +138,47 @@ def generate_response():
         app.logger.error(f"Error generating response: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+def _sse(event, payload):
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+@app.route('/api/generate_response/stream', methods=['POST'])
+def generate_response_stream():
+    """
+    Stream a response to user input as Server-Sent Events: one `token` event per
+    text chunk, then a `done` event with the full response and the turn count.
+    """
+    data = request.json
+    user_message = data.get('user_message')
+    session_id = data.get('session_id', 'default')
+    
+    if not user_message:
+        return jsonify({'error': 'User message is required'}), 400
+    
+    if session_id not in conversations:
+        return jsonify({'error': 'Conversation not found. Please start a new conversation.'}), 404
+    
+    conversation_manager = conversations[session_id]['manager']
+    
+    def events():
+        # If the client disconnects, closing this generator also closes the LLM stream
+        chunks = []
+        try:
+            for chunk in conversation_manager.generate_response_stream(user_message):
+                chunks.append(chunk)
+                yield _sse('token', {'text': chunk})
+            yield _sse('done', {
+                'success': True,
+                'response': ''.join(chunks).strip(),
+                'turn_count': len([msg for msg in conversation_manager.conversation_history if msg['speaker'] == 'user'])
+            })
+        except Exception as e:
+            app.logger.error(f"Error streaming response: {str(e)}")
+            yield _sse('error', {'error': 'Internal server error'})
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/generate_report', methods=['POST'])
 def generate_report():
     """Generate conversation analysis report."""
@@ -5,7 +5,7 @@ Handles three different conversation scenarios with LLM-powered responses.
 
 import json
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 import re
 from llm_manager import LLMManager
 
@@ -99,6 +99,30 @@ class ConversationManager:
         
         return response
     
+    def generate_response_stream(self, user_input: str, stt_errors: List[str] = None, cancel_event=None) -> Iterator[str]:
+        """
+        Streaming variant of generate_response: yields reply text chunks as they arrive.
+        The reply (or the part produced before cancellation) is added to the history when the stream ends.
+        """
+        if not self.current_scenario:
+            raise ValueError("No active conversation. Please start a conversation first.")
+        
+        if stt_errors:
+            self.pronunciation_errors.extend(stt_errors)
+        
+        self._add_to_history("user", user_input)
+        
+        chunks = []
+        stream = self.llm_manager.generate_response_stream(user_input, cancel_event=cancel_event)
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            # Closing the inner stream records the partial reply in the LLM history too
+            stream.close()
+            self._add_to_history("bot", "".join(chunks).strip())
+    
     def _generate_contextual_response(self, user_input: str, context: Dict) -> str:
         """Generate a response based on the current scenario context."""
         scenario = self.current_scenario
@@ -4,7 +4,7 @@ Handles interaction with Google Gemini 2.0 Flash for dynamic conversation genera
 """
 
 import google.generativeai as genai
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 from datetime import datetime
 import config
 
@@ -116,6 +116,15 @@ Be respectful, professional, and focused on project objectives. The conversation
     
     def generate_response(self, user_input: str) -> str:
         """Generate a response based on user input and conversation history."""
+        return "".join(self.generate_response_stream(user_input)).strip()
+    
+    def generate_response_stream(self, user_input: str, cancel_event=None) -> Iterator[str]:
+        """
+        Generate a response like generate_response, yielding text chunks as Gemini produces them.
+        
+        Setting `cancel_event` (a threading.Event) or closing the generator stops the stream;
+        whatever text was produced so far is recorded in the conversation history.
+        """
         if not self.current_scenario:
             raise ValueError("No active conversation. Please start a conversation first.")
         
@@ -125,20 +134,33 @@ Be respectful, professional, and focused on project objectives. The conversation
         # Build the prompt with context
         full_prompt = self._build_prompt_with_context(user_input)
         
+        chunks = []
         try:
-            # Generate response using Gemini
-            response = self.model.generate_content(full_prompt)
-            bot_response = response.text.strip()
-            
-            # Add bot response to history
-            self._add_to_history("assistant", bot_response)
-            
-            return bot_response
+            # Generate response using Gemini, streamed chunk by chunk
+            response = self.model.generate_content(full_prompt, stream=True)
+            for chunk in response:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                text = chunk.text
+                if not text:
+                    continue
+                if not chunks:
+                    text = text.lstrip()
+                chunks.append(text)
+                yield text
             
         except Exception as e:
-            error_message = f"I apologize, but I'm having trouble generating a response right now. Error: {str(e)}"
-            self._add_to_history("assistant", error_message)
-            return error_message
+            if chunks:
+                # The user already has part of the reply; keep it rather than appending an apology
+                print(f"Response stream interrupted: {e}")
+            else:
+                error_message = f"I apologize, but I'm having trouble generating a response right now. Error: {str(e)}"
+                chunks = [error_message]
+                yield error_message
+            
+        finally:
+            # Runs on completion, error, cancellation and generator close alike
+            self._add_to_history("assistant", "".join(chunks).strip())
     
     def _build_prompt_with_context(self, user_input: str) -> str:
         """Build a prompt with conversation context for the LLM."""
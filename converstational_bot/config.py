@@ -30,3 +30,8 @@ MIN_CONVERSATION_TURNS = 3
 SAMPLE_RATE = 16000
 CHANNELS = 1
 FRAMES_PER_BUFFER = 800
+
+# Speculative responses: start generating the reply once the partial transcript
+# has been stable this long, before the final formatted transcript arrives
+SPECULATIVE_RESPONSES = os.getenv('SPECULATIVE_RESPONSES', 'true').lower() == 'true'
+SPECULATION_STABLE_SECONDS = float(os.getenv('SPECULATION_STABLE_SECONDS', '0.4'))
@@ -12,6 +12,7 @@ import json
 from conversation_manager import ConversationManager
 from audio_processor import AudioProcessor
 from report_generator import ReportGenerator
+from speculative_response import SpeculativeResponder
 import config
 
 class ConversationalBot:
@@ -20,6 +21,9 @@ class ConversationalBot:
         self.audio_processor = AudioProcessor()
         self.report_generator = ReportGenerator()
         
+        # Drafts replies from partial transcripts (see speculative_response.py)
+        self.speculator = SpeculativeResponder(self.conversation_manager) if config.SPECULATIVE_RESPONSES else None
+        
         self.is_running = False
         self.current_scenario = None
         self.conversation_active = False
@@ -65,16 +69,27 @@ class ConversationalBot:
                     print("No input received. Ending conversation.")
                     break
                 
-                # Generate bot response
-                print("Generating response...")
-                bot_response = self.conversation_manager.generate_response(
-                    user_input, 
-                    self.audio_processor.pronunciation_errors
-                )
+                # Use the reply drafted from the partial transcript if the final one matches
+                drafted_response = self.speculator.resolve(user_input) if self.speculator else None
                 
-                # Speak the response
-                print(f"Bot: {bot_response}")
-                self.audio_processor.speak_text(bot_response)
+                if drafted_response:
+                    self.conversation_manager.commit_response(
+                        user_input,
+                        drafted_response,
+                        self.audio_processor.pronunciation_errors
+                    )
+                    print(f"Bot: {drafted_response}")
+                    self.audio_processor.speak_stream([drafted_response])
+                else:
+                    # Generate the bot response and speak it sentence by sentence as it streams in
+                    print("Generating response...")
+                    response_chunks = self.conversation_manager.generate_response_stream(
+                        user_input, 
+                        self.audio_processor.pronunciation_errors
+                    )
+                    print("Bot: ", end="", flush=True)
+                    self.audio_processor.speak_stream(self._echo_chunks(response_chunks))
+                    print()
                 
                 turn_count += 1
                 
@@ -92,6 +107,13 @@ class ConversationalBot:
         finally:
             self._end_conversation()
     
+    @staticmethod
+    def _echo_chunks(chunks):
+        """Print streamed response text as it arrives while passing it on."""
+        for chunk in chunks:
+            print(chunk, end="", flush=True)
+            yield chunk
+    
     def _listen_for_user_input(self) -> Optional[str]:
         """Listen for user input using STT."""
         user_input = None
@@ -104,13 +126,16 @@ class ConversationalBot:
             input_received.set()
         
         # Start listening
-        self.audio_processor.start_listening(on_transcript_received)
+        partial_callback = self.speculator.on_partial if self.speculator else None
+        self.audio_processor.start_listening(on_transcript_received, partial_callback)
         
         # Wait for input with timeout
         if input_received.wait(timeout=30):  # 30 second timeout
             return user_input
         else:
             print("Timeout waiting for user input")
+            if self.speculator:
+                self.speculator.cancel()
             self.audio_processor.stop_listening()
             return None
     
@@ -135,8 +160,13 @@ class ConversationalBot:
         self.is_running = False
         self.conversation_active = False
         
-        # Stop audio processing
-        self.audio_processor.stop_listening()
+        # Stop audio processing and close the STT session
+        self.audio_processor.close_session()
+        
+        if self.speculator and self.speculator.turns:
+            stats = self.speculator.get_stats()
+            print(f"Speculative replies used: {stats['hits']}/{stats['turns']} turns "
+                  f"({stats['hit_rate']:.0%} hit rate, {stats['drafts_started']} drafts started)")
         
         # Save conversation audio
         audio_file = self.audio_processor.save_conversation_audio()
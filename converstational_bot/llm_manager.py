@@ -4,7 +4,7 @@ Handles interaction with Google Gemini 2.0 Flash for dynamic conversation genera
 """
 
 import google.generativeai as genai
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 from datetime import datetime
 import config
 
@@ -116,6 +116,15 @@ Be respectful, professional, and focused on project objectives. The conversation
     
     def generate_response(self, user_input: str) -> str:
         """Generate a response based on user input and conversation history."""
+        return "".join(self.generate_response_stream(user_input)).strip()
+    
+    def generate_response_stream(self, user_input: str, cancel_event=None) -> Iterator[str]:
+        """
+        Generate a response like generate_response, yielding text chunks as Gemini produces them.
+        
+        Setting `cancel_event` (a threading.Event) or closing the generator stops the stream;
+        whatever text was produced so far is recorded in the conversation history.
+        """
         if not self.current_scenario:
             raise ValueError("No active conversation. Please start a conversation first.")
         
@@ -125,29 +134,72 @@ Be respectful, professional, and focused on project objectives. The conversation
         # Build the prompt with context
         full_prompt = self._build_prompt_with_context(user_input)
         
+        chunks = []
         try:
-            # Generate response using Gemini
-            response = self.model.generate_content(full_prompt)
-            bot_response = response.text.strip()
+            # Generate response using Gemini, streamed chunk by chunk
+            response = self.model.generate_content(full_prompt, stream=True)
+            for chunk in response:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                text = chunk.text
+                if not text:
+                    continue
+                if not chunks:
+                    text = text.lstrip()
+                chunks.append(text)
+                yield text
             
-            # Add bot response to history
-            self._add_to_history("assistant", bot_response)
-            
-            return bot_response
+        except Exception as e:
+            if chunks:
+                # The user already has part of the reply; keep it rather than appending an apology
+                print(f"Response stream interrupted: {e}")
+            else:
+                error_message = f"I apologize, but I'm having trouble generating a response right now. Error: {str(e)}"
+                chunks = [error_message]
+                yield error_message
             
+        finally:
+            # Runs on completion, error, cancellation and generator close alike
+            self._add_to_history("assistant", "".join(chunks).strip())
+    
+    def draft_response(self, user_input: str, cancel_event=None) -> Optional[str]:
+        """
+        Generate a reply to `user_input` without touching the conversation history (used for
+        speculative generation). Returns None if cancelled or if generation fails.
+        """
+        if not self.current_scenario:
+            return None
+        
+        full_prompt = self._build_prompt_with_context(user_input, self.conversation_history)
+        
+        chunks = []
+        try:
+            for chunk in self.model.generate_content(full_prompt, stream=True):
+                if cancel_event is not None and cancel_event.is_set():
+                    return None
+                chunks.append(chunk.text)
         except Exception as e:
-            error_message = f"I apologize, but I'm having trouble generating a response right now. Error: {str(e)}"
-            self._add_to_history("assistant", error_message)
-            return error_message
+            print(f"Speculative generation failed: {e}")
+            return None
+        
+        return "".join(chunks).strip()
     
-    def _build_prompt_with_context(self, user_input: str) -> str:
+    def record_exchange(self, user_input: str, bot_response: str):
+        """Record a user turn and the reply to it, e.g. a draft that was accepted."""
+        self._add_to_history("user", user_input)
+        self._add_to_history("assistant", bot_response)
+    
+    def _build_prompt_with_context(self, user_input: str, history: List[Dict] = None) -> str:
         """Build a prompt with conversation context for the LLM."""
         scenario_info = self.scenario_prompts[self.current_scenario]
         system_prompt = scenario_info["system_prompt"]
         
+        if history is None:
+            history = self.conversation_history[:-1]  # Exclude the latest user input we just added
+        
         # Build conversation context
         context = "Conversation so far:\n"
-        for msg in self.conversation_history[:-1]:  # Exclude the latest user input we just added
+        for msg in history:
             speaker = "Customer" if msg["role"] == "user" else "You"
             context += f"{speaker}: {msg['content']}\n"
         
@@ -0,0 +1,115 @@
+"""
+Speculative Response Generation
+Drafts the bot reply from partial STT transcripts while the user is finishing their turn.
+
+AssemblyAI streams unformatted partial `Turn` messages while the user speaks. Once the
+partial transcript has stopped changing for a short window, a reply is drafted in the
+background. When the final formatted transcript arrives it is compared with the one the
+draft was based on: on a match the draft is used as the reply, otherwise the draft is
+cancelled and the caller generates a reply as usual.
+"""
+
+import re
+import threading
+from typing import Dict, Optional
+
+import config
+
+
+def normalize_transcript(text: str) -> str:
+    """Lowercase and drop punctuation; end-of-turn formatting only changes those."""
+    return " ".join(re.sub(r"[^\w\s']", " ", text.lower()).split())
+
+
+class SpeculativeResponder:
+    def __init__(self, conversation_manager, stable_seconds: float = None):
+        self.conversation_manager = conversation_manager
+        self.stable_seconds = config.SPECULATION_STABLE_SECONDS if stable_seconds is None else stable_seconds
+        
+        # Statistics
+        self.turns = 0
+        self.hits = 0
+        self.misses = 0
+        self.drafts_started = 0
+        
+        self._lock = threading.Lock()
+        self._timer = None
+        self._partial = ""
+        self._draft = None
+    
+    def on_partial(self, transcript: str):
+        """Feed an unformatted partial transcript; (re)starts the stability timer when it changes."""
+        key = normalize_transcript(transcript)
+        with self._lock:
+            if not key or key == self._partial:
+                return
+            self._partial = key
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.stable_seconds, self._start_draft, args=(key, transcript))
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def _start_draft(self, key: str, transcript: str):
+        with self._lock:
+            # The transcript changed while the timer was running, or this draft already exists
+            if key != self._partial or (self._draft and self._draft["key"] == key):
+                return
+            if self._draft:
+                self._draft["cancel"].set()
+            draft = {"key": key, "cancel": threading.Event(), "done": threading.Event(), "response": None}
+            self._draft = draft
+            self.drafts_started += 1
+        
+        threading.Thread(target=self._run_draft, args=(draft, transcript), daemon=True).start()
+    
+    def _run_draft(self, draft: Dict, transcript: str):
+        try:
+            draft["response"] = self.conversation_manager.draft_response(transcript, cancel_event=draft["cancel"])
+        finally:
+            draft["done"].set()
+    
+    def _take_draft(self) -> Optional[Dict]:
+        """Stop the timer and detach the current draft, ready for the next turn."""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            draft, self._draft = self._draft, None
+            self._partial = ""
+        return draft
+    
+    def resolve(self, final_transcript: str) -> Optional[str]:
+        """
+        Return the drafted reply if it was based on `final_transcript`. Otherwise the draft
+        is cancelled and None is returned, and the caller should generate the reply itself.
+        """
+        draft = self._take_draft()
+        self.turns += 1
+        
+        if draft and draft["key"] == normalize_transcript(final_transcript):
+            # Usually finished already; otherwise it is still ahead of a fresh request
+            draft["done"].wait()
+            if draft["response"]:
+                self.hits += 1
+                return draft["response"]
+        
+        if draft:
+            draft["cancel"].set()
+            self.misses += 1
+        return None
+    
+    def cancel(self):
+        """Drop any pending draft, e.g. when the turn ends without a transcript."""
+        draft = self._take_draft()
+        if draft:
+            draft["cancel"].set()
+    
+    def get_stats(self) -> Dict:
+        return {
+            "turns": self.turns,
+            "hits": self.hits,
+            "misses": self.misses,
+            "drafts_started": self.drafts_started,
+            "hit_rate": self.hits / self.turns if self.turns else 0.0
+        }
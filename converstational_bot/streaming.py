@@ -4,10 +4,12 @@
 
 import pyaudio
 import websocket
+from vad import EnergyVAD
+from wav_recorder import StreamingWavRecorder
 import json
 import threading
+import os
 import time
-import wave
 from urllib.parse import urlencode
 from datetime import datetime
 
@@ -26,16 +28,22 @@ SAMPLE_RATE = CONNECTION_PARAMS["sample_rate"]
 CHANNELS = 1
 FORMAT = pyaudio.paInt16
 
+# Voice activity detection: only speech frames are sent, and a turn is force-ended
+# after this much silence following speech
+USE_VAD = True
+VAD_ENDPOINT_MS = 800
+vad = EnergyVAD(SAMPLE_RATE, FRAMES_PER_BUFFER, endpoint_ms=VAD_ENDPOINT_MS)
+
 # Global variables for audio stream and websocket
 audio = None
 stream = None
 ws_app = None
 audio_thread = None
 stop_event = threading.Event()  # To signal the audio thread to stop
+termination_received = threading.Event()  # Set when the server confirms the session ended
 
-# WAV recording variables
-recorded_frames = []  # Store audio frames for WAV file
-recording_lock = threading.Lock()  # Thread-safe access to recorded_frames
+# WAV recording: frames are appended to the file as they arrive (see wav_recorder.py)
+recorder = None
 
 # --- WebSocket Event Handlers ---
 
@@ -53,16 +61,30 @@ def on_open(ws):
                 audio_data = stream.read(FRAMES_PER_BUFFER, exception_on_overflow=False)
 
                 # Store audio data for WAV recording
-                with recording_lock:
-                    recorded_frames.append(audio_data)
-
-                # Send audio data as binary message
-                ws.send(audio_data, websocket.ABNF.OPCODE_BINARY)
+                active_recorder = recorder
+                if active_recorder:
+                    active_recorder.write(audio_data)
+
+                if not USE_VAD:
+                    # Send audio data as binary message
+                    ws.send(audio_data, websocket.ABNF.OPCODE_BINARY)
+                    continue
+
+                # Send speech frames only; end the turn locally once the speaker pauses
+                frames_to_send, endpoint = vad.process(audio_data)
+                for frame in frames_to_send:
+                    ws.send(frame, websocket.ABNF.OPCODE_BINARY)
+                if endpoint:
+                    ws.send(json.dumps({"type": "ForceEndpoint"}))
+                    vad.reset()
             except Exception as e:
                 print(f"Error streaming audio: {e}")
                 # If stream read fails, likely means it's closed, stop the loop
                 break
         print("Audio streaming stopped.")
+        if USE_VAD:
+            stats = vad.get_stats()
+            print(f"VAD sent {stats['frames_sent']}/{stats['frames_in']} frames ({stats['fraction_sent']:.0%}).")
 
     global audio_thread
     audio_thread = threading.Thread(target=stream_audio)
@@ -94,6 +116,7 @@ def on_message(ws, message):
             audio_duration = data.get('audio_duration_seconds', 0)
             session_duration = data.get('session_duration_seconds', 0)
             print(f"\nSession Terminated: Audio Duration={audio_duration}s, Session Duration={session_duration}s")
+            termination_received.set()
     except json.JSONDecodeError as e:
         print(f"Error decoding message: {e}")
     except Exception as e:
@@ -129,34 +152,28 @@ def on_close(ws, close_status_code, close_msg):
         audio_thread.join(timeout=1.0)
 
 def save_wav_file():
-    """Save recorded audio frames to a WAV file."""
-    if not recorded_frames:
-        print("No audio data recorded.")
+    """Finish the WAV recording (flushes pending frames and patches the header)."""
+    global recorder
+    if recorder is None:
         return
-
-    # Generate filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"recorded_audio_{timestamp}.wav"
+    finished, recorder = recorder, None
 
     try:
-        with wave.open(filename, 'wb') as wf:
-            wf.setnchannels(CHANNELS)
-            wf.setsampwidth(2)  # 16-bit = 2 bytes
-            wf.setframerate(SAMPLE_RATE)
-
-            # Write all recorded frames
-            with recording_lock:
-                wf.writeframes(b''.join(recorded_frames))
+        filename = finished.close()
+        if not finished.frames_written:
+            os.remove(filename)
+            print("No audio data recorded.")
+            return
 
         print(f"Audio saved to: {filename}")
-        print(f"Duration: {len(recorded_frames) * FRAMES_PER_BUFFER / SAMPLE_RATE:.2f} seconds")
+        print(f"Duration: {finished.duration_seconds:.2f} seconds")
 
     except Exception as e:
         print(f"Error saving WAV file: {e}")
 
 # --- Main Execution ---
 def run():
-    global audio, stream, ws_app
+    global audio, stream, ws_app, recorder
 
     # Initialize PyAudio
     audio = pyaudio.PyAudio()
@@ -173,6 +190,8 @@ def run():
         print("Microphone stream opened successfully.")
         print("Speak into your microphone. Press Ctrl+C to stop.")
         print("Audio will be saved to a WAV file when the session ends.")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        recorder = StreamingWavRecorder(f"recorded_audio_{timestamp}.wav", CHANNELS, SAMPLE_RATE)
     except Exception as e:
         print(f"Error opening microphone stream: {e}")
         if audio:
@@ -208,8 +227,9 @@ def run():
                 terminate_message = {"type": "Terminate"}
                 print(f"Sending termination message: {json.dumps(terminate_message)}")
                 ws_app.send(json.dumps(terminate_message))
-                # Give a moment for messages to process before forceful close
-                time.sleep(5)
+                # Wait for the final transcripts and the Termination message before closing
+                if not termination_received.wait(timeout=5):
+                    print("Timed out waiting for session termination.")
             except Exception as e:
                 print(f"Error sending termination message: {e}")
 
@@ -250,9 +250,19 @@ def process_user_input(user_input):
         "timestamp": datetime.now().strftime("%H:%M:%S")
     })
     
-    # Generate bot response
+    # Generate bot response, showing the text as it streams in
     try:
-        bot_response = st.session_state.bot.generate_response(user_input)
+        placeholder = st.empty()
+        bot_response = ""
+        for chunk in st.session_state.bot.generate_response_stream(user_input):
+            bot_response += chunk
+            placeholder.markdown(f"""
+            <div class="conversation-bubble bot-bubble">
+                <strong>Bot:</strong><br>
+                {bot_response}
+            </div>
+            """, unsafe_allow_html=True)
+        bot_response = bot_response.strip()
         
         # Add bot response to history
         st.session_state.conversation_history.append({
@@ -0,0 +1,70 @@
+"""
+G.711 mu-law tables, downsampling and the STT transport encoder.
+
+    python -m pytest test_audio_codec.py
+"""
+
+import sys
+import warnings
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+import pytest
+
+from audio_codec import TransportEncoder, downsample, mulaw_decode, mulaw_encode
+
+ALL_SAMPLES = np.arange(-32768, 32768, dtype=np.int32).astype(np.int16)
+ALL_CODES = np.arange(256, dtype=np.uint8)
+
+
+def test_mulaw_reference_values():
+    samples = np.array([0, -1, 100, -100, 1000, -1000, 32767, -32768], dtype=np.int16)
+    assert mulaw_encode(samples).tolist() == [0xFF, 0x7E, 0xF2, 0x72, 0xCE, 0x4E, 0x80, 0x00]
+    codes = np.array([0xFF, 0x7F, 0xF0, 0x70, 0x80, 0x00], dtype=np.uint8)
+    assert mulaw_decode(codes).tolist() == [0, 0, 120, -120, 32124, -32124]
+
+
+def test_mulaw_code_round_trip():
+    round_trip = mulaw_encode(mulaw_decode(ALL_CODES))
+    # 0x7F is negative zero, which decodes to 0 and re-encodes as 0xFF
+    assert np.array_equal(round_trip[ALL_CODES != 0x7F], ALL_CODES[ALL_CODES != 0x7F])
+    assert round_trip[0x7F] == 0xFF
+
+
+def test_mulaw_sample_round_trip_error():
+    error = np.abs(mulaw_decode(mulaw_encode(ALL_SAMPLES)).astype(np.int32) - ALL_SAMPLES)
+    magnitude = np.abs(ALL_SAMPLES.astype(np.int32))
+    # The smallest segment step is 8 at 14-bit resolution (16 at 16-bit)
+    assert error[magnitude <= 256].max() < 16
+    # Logarithmic companding: the error stays a small fraction of the sample
+    assert (error[magnitude > 256] / magnitude[magnitude > 256]).max() < 0.06
+
+
+def test_mulaw_matches_audioop():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        audioop = pytest.importorskip("audioop")
+    assert mulaw_encode(ALL_SAMPLES).tobytes() == audioop.lin2ulaw(ALL_SAMPLES.tobytes(), 2)
+    assert mulaw_decode(ALL_CODES).tobytes() == audioop.ulaw2lin(ALL_CODES.tobytes(), 2)
+
+
+def test_downsample_averages_groups():
+    samples = np.array([10, 20, -4, -6, 7, 100, 1], dtype=np.int16)
+    assert downsample(samples, 2).tolist() == [15, -5, 53]
+    assert downsample(samples, 1) is samples
+
+
+def test_transport_encoder_sizes():
+    pcm = np.zeros(800, dtype=np.int16).tobytes()
+    assert TransportEncoder(16000).encode(pcm) is pcm
+    assert len(TransportEncoder(16000, "pcm_mulaw").encode(pcm)) == 800
+    assert len(TransportEncoder(16000, "pcm_mulaw", 8000).encode(pcm)) == 400
+    assert TransportEncoder(16000, "pcm_mulaw", 8000).connection_params() == {"sample_rate": 8000, "encoding": "pcm_mulaw"}
+
+
+def test_transport_encoder_rejects_bad_settings():
+    with pytest.raises(ValueError):
+        TransportEncoder(16000, "opus")
+    with pytest.raises(ValueError):
+        TransportEncoder(16000, "pcm_s16le", 6000)
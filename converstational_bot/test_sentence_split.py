@@ -0,0 +1,56 @@
+"""
+Sentence splitting for the streamed TTS pipeline (audio_processor.split_complete_sentences).
+
+    python -m pytest test_sentence_split.py
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import pytest
+
+# audio_processor opens audio devices and the Murf client; skip where they are not installed
+pytest.importorskip("pyaudio")
+pytest.importorskip("murf")
+
+from audio_processor import split_complete_sentences
+
+
+def test_splits_complete_sentences_and_keeps_the_rest():
+    assert split_complete_sentences("Hello there, how are you today? I am fi") == (
+        ["Hello there, how are you today?"], "I am fi"
+    )
+
+
+def test_waits_for_whitespace_after_the_last_full_stop():
+    # The stream may still continue the sentence ("3." -> "3.50")
+    assert split_complete_sentences("That ticket costs about 3.") == ([], "That ticket costs about 3.")
+    assert split_complete_sentences("That ticket costs about 3.50 dollars") == ([], "That ticket costs about 3.50 dollars")
+
+
+def test_short_sentences_merge_with_the_next_one():
+    assert split_complete_sentences("Hi. How are you doing today? Ok") == (
+        ["Hi. How are you doing today?"], "Ok"
+    )
+
+
+def test_closing_quote_stays_with_its_sentence():
+    assert split_complete_sentences('She said "See you at the station." Then') == (
+        ['She said "See you at the station."'], "Then"
+    )
+
+
+def test_streamed_chunks_give_the_same_sentences():
+    reply = "Great question, let me think about it. The museum opens at nine! Would you like directions? "
+    sentences, buffer = [], ""
+    for i in range(0, len(reply), 7):
+        buffer += reply[i:i + 7]
+        done, buffer = split_complete_sentences(buffer)
+        sentences += done
+    assert sentences == [
+        "Great question, let me think about it.",
+        "The museum opens at nine!",
+        "Would you like directions?",
+    ]
+    assert buffer == ""
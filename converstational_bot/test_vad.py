@@ -0,0 +1,73 @@
+"""
+Energy / ZCR VAD: frame features, pre-roll, hangover and endpoint timing.
+
+    python -m pytest test_vad.py
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+
+from vad import EnergyVAD, frame_features
+
+SAMPLE_RATE = 16000
+FRAME_SAMPLES = 800  # 50 ms
+
+
+def _tone(amplitude=5000, freq=200):
+    t = np.arange(FRAME_SAMPLES) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16).tobytes()
+
+
+SPEECH = _tone()
+SILENCE = bytes(2 * FRAME_SAMPLES)
+
+
+def test_frame_features():
+    alternating = np.tile(np.array([1000, -1000], dtype=np.int16), FRAME_SAMPLES // 2).tobytes()
+    rms, zcr = frame_features(SILENCE + alternating, FRAME_SAMPLES)
+    assert rms.tolist() == [0.0, 1000.0]
+    assert zcr.tolist() == [0.0, 1.0]
+
+
+def test_high_zero_crossing_rate_is_not_speech():
+    vad = EnergyVAD(SAMPLE_RATE, FRAME_SAMPLES)
+    hiss = _tone(freq=7000)
+    assert vad.process(hiss) == ([], False)
+
+
+def test_pre_roll_is_released_with_the_first_speech_frame():
+    vad = EnergyVAD(SAMPLE_RATE, FRAME_SAMPLES, pre_roll_ms=150)
+    for _ in range(5):
+        assert vad.process(SILENCE) == ([], False)
+    sent, _ = vad.process(SPEECH)
+    assert sent == [SILENCE] * 3 + [SPEECH]
+
+
+def test_hangover_then_endpoint_after_800ms_of_silence():
+    vad = EnergyVAD(SAMPLE_RATE, FRAME_SAMPLES, hangover_ms=300, endpoint_ms=800)
+    for _ in range(10):
+        assert vad.process(SPEECH) == ([SPEECH], False)
+
+    results = [vad.process(SILENCE) for _ in range(20)]
+    # 300 ms of trailing silence is still sent, then frames are held back
+    assert [len(sent) for sent, _ in results] == [1] * 6 + [0] * 14
+    # The endpoint fires once, on the 16th silent frame (16 x 50 ms = 800 ms)
+    assert [i for i, (_, endpoint) in enumerate(results, 1) if endpoint] == [16]
+
+
+def test_short_pause_does_not_endpoint():
+    vad = EnergyVAD(SAMPLE_RATE, FRAME_SAMPLES, endpoint_ms=800)
+    vad.process(SPEECH)
+    pause = [vad.process(SILENCE)[1] for _ in range(10)]
+    vad.process(SPEECH)
+    after = [vad.process(SILENCE)[1] for _ in range(15)]
+    assert not any(pause) and not any(after)
+
+
+def test_no_endpoint_without_speech():
+    vad = EnergyVAD(SAMPLE_RATE, FRAME_SAMPLES, endpoint_ms=800)
+    assert not any(vad.process(SILENCE)[1] for _ in range(40))
+    assert vad.get_stats()["frames_sent"] == 0
@@ -0,0 +1,104 @@
+"""
+Voice Activity Detection
+Energy / zero-crossing-rate VAD used to gate microphone frames before they are sent to STT.
+
+Each block of 16-bit PCM is classified from its RMS energy and zero-crossing rate. The
+energy threshold follows the background noise floor, a short pre-roll keeps the start of
+words, and a hangover keeps trailing consonants and short pauses. After a stretch of
+silence following speech an endpoint is reported, so the caller can end the turn without
+waiting for the server to notice the silence.
+"""
+
+from collections import deque
+from typing import List, Tuple
+
+import numpy as np
+
+
+def frame_features(pcm: bytes, frame_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+    """RMS energy and zero-crossing rate of every `frame_samples` block in `pcm` (int16 mono)."""
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    frames = samples[:len(samples) - len(samples) % frame_samples].reshape(-1, frame_samples).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frame_samples - 1)
+    return rms, zcr
+
+
+class EnergyVAD:
+    def __init__(self, sample_rate: int = 16000, frame_samples: int = 800,
+                 min_rms: float = 300.0, noise_ratio: float = 3.0, max_zcr: float = 0.4,
+                 pre_roll_ms: int = 150, hangover_ms: int = 300, endpoint_ms: int = 800):
+        self.frame_samples = frame_samples
+        self.min_rms = min_rms
+        self.noise_ratio = noise_ratio
+        self.max_zcr = max_zcr
+        
+        frame_ms = 1000 * frame_samples / sample_rate
+        self.hangover_frames = max(1, round(hangover_ms / frame_ms))
+        self.endpoint_frames = max(1, round(endpoint_ms / frame_ms))
+        self.pre_roll = deque(maxlen=max(1, round(pre_roll_ms / frame_ms)))
+        
+        # Statistics
+        self.frames_in = 0
+        self.frames_sent = 0
+        
+        self.noise_floor = min_rms / noise_ratio
+        self.reset()
+    
+    def reset(self):
+        """Start a new turn (the noise floor estimate is kept)."""
+        self.pre_roll.clear()
+        self.in_speech = False
+        self.heard_speech = False
+        self.hangover_left = 0
+        self.silent_frames = 0
+    
+    def is_speech(self, rms: float, zcr: float) -> bool:
+        threshold = max(self.min_rms, self.noise_floor * self.noise_ratio)
+        speech = rms >= threshold and zcr <= self.max_zcr
+        if not speech:
+            # Track the background level from non-speech frames only
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+        return speech
+    
+    def process(self, frame: bytes) -> Tuple[List[bytes], bool]:
+        """
+        Classify one block. Returns (frames to send now, endpoint reached). Silent frames
+        are held back; the pre-roll is released when speech starts.
+        """
+        self.frames_in += 1
+        rms, zcr = frame_features(frame, self.frame_samples)
+        speech = self.is_speech(float(rms[0]), float(zcr[0])) if len(rms) else False
+        
+        if speech:
+            self.hangover_left = self.hangover_frames
+            self.silent_frames = 0
+            self.heard_speech = True
+            active = True
+        else:
+            # Silence right after speech is still sent for the hangover period
+            active = self.hangover_left > 0
+            self.hangover_left = max(0, self.hangover_left - 1)
+            self.silent_frames += 1
+        
+        if active:
+            to_send = list(self.pre_roll) + [frame] if not self.in_speech else [frame]
+            self.pre_roll.clear()
+        else:
+            to_send = []
+            self.pre_roll.append(frame)
+        self.in_speech = active
+        self.frames_sent += len(to_send)
+        
+        # Endpoint once per speech segment, after enough silence since the last speech frame
+        endpoint = self.heard_speech and self.silent_frames == self.endpoint_frames
+        return to_send, endpoint
+    
+    def get_stats(self) -> dict:
+        return {
+            "frames_in": self.frames_in,
+            "frames_sent": self.frames_sent,
+            "fraction_sent": self.frames_sent / self.frames_in if self.frames_in else 0.0,
+            "noise_floor": self.noise_floor
+        }
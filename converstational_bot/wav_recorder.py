@@ -0,0 +1,89 @@
+"""
+Streaming WAV Recorder
+Appends audio frames to a WAV file on a background thread, so a session is never held in memory.
+
+The audio thread only enqueues frames; a writer thread appends them to the file and the
+WAV header (frame count / data size) is patched when the recorder is closed. If writing
+fails (disk full, I/O error) the writer stops, later buffers are dropped and close()
+raises the error.
+"""
+
+import queue
+import threading
+import wave
+
+
+class StreamingWavRecorder:
+    def __init__(self, filename: str, channels: int = 1, sample_rate: int = 16000, sample_width: int = 2):
+        self.filename = filename
+        self.sample_rate = sample_rate
+        self.frames_written = 0  # audio frames (samples per channel), not buffers
+        self.dropped_buffers = 0
+        self.error = None  # set if the writer thread failed
+        
+        self._bytes_per_frame = channels * sample_width
+        self._queue = queue.Queue(maxsize=1000)  # ~50 s of 50 ms buffers
+        self._closed = False
+        
+        self._wav = wave.open(filename, 'wb')
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(sample_width)
+        self._wav.setframerate(sample_rate)
+        
+        self._writer = threading.Thread(target=self._write_loop, name="wav-writer", daemon=True)
+        self._writer.start()
+    
+    def write(self, audio_data: bytes):
+        """Queue a buffer for writing; never blocks the caller."""
+        if self._closed:
+            return
+        if self.error is not None:
+            self.dropped_buffers += 1
+            return
+        try:
+            self._queue.put_nowait(audio_data)
+        except queue.Full:
+            # The disk cannot keep up; losing a buffer beats stalling the microphone
+            self.dropped_buffers += 1
+    
+    def _write_loop(self):
+        while True:
+            audio_data = self._queue.get()
+            if audio_data is None:
+                break
+            try:
+                # writeframesraw appends without re-patching the header on every buffer
+                self._wav.writeframesraw(audio_data)
+            except Exception as e:
+                print(f"Error writing WAV file {self.filename}: {e}")
+                self.error = e
+                return
+            self.frames_written += len(audio_data) // self._bytes_per_frame
+    
+    @property
+    def duration_seconds(self) -> float:
+        return self.frames_written / self.sample_rate
+    
+    def close(self) -> str:
+        """
+        Flush queued buffers, patch the WAV header and close the file. Returns the filename,
+        or raises the error that stopped the writer thread.
+        """
+        if not self._closed:
+            self._closed = True
+            # A writer that died leaves a full queue nobody drains; never block on it
+            while self._writer.is_alive():
+                try:
+                    self._queue.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            self._writer.join()
+            try:
+                self._wav.close()
+            except Exception as e:
+                if self.error is None:
+                    self.error = e
+        if self.error is not None:
+            raise self.error
+        return self.filename
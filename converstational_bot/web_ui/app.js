@@ -256,8 +256,10 @@ async function sendMessage(userMessage) {
     // Get bot response
     showLoading(true);
     
+    let streamingMessage = null;
+    
     try {
-        const response = await fetch(`${API_URL}/generate_response`, {
+        const response = await fetch(`${API_URL}/generate_response/stream`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -273,10 +275,32 @@ async function sendMessage(userMessage) {
             throw new Error('Failed to get response');
         }
         
-        const data = await response.json();
-        const botResponse = data.response || "I understand. Could you tell me more?";
+        // Render tokens as they arrive
+        let partialText = '';
+        let finalData = null;
+        await readServerSentEvents(response, (event, data) => {
+            if (event === 'token') {
+                if (!streamingMessage) {
+                    showLoading(false);
+                    streamingMessage = addStreamingMessage();
+                }
+                partialText += data.text;
+                streamingMessage.querySelector('.message-text').textContent = partialText;
+                document.getElementById('chat-container').scrollTop = document.getElementById('chat-container').scrollHeight;
+            } else if (event === 'done') {
+                finalData = data;
+            } else if (event === 'error') {
+                throw new Error(data.error || 'Failed to get response');
+            }
+        });
         
-        // Add bot message
+        const botResponse = (finalData && finalData.response) || partialText.trim() || "I understand. Could you tell me more?";
+        
+        // Replace the streaming bubble with the finished message
+        if (streamingMessage) {
+            streamingMessage.remove();
+            streamingMessage = null;
+        }
         addMessage('bot', botResponse);
         
         // Speak the response
@@ -286,6 +310,9 @@ async function sendMessage(userMessage) {
         
     } catch (error) {
         console.error('Error getting response:', error);
+        if (streamingMessage) {
+            streamingMessage.remove();
+        }
         // Fallback response
         const botResponse = getFallbackResponse(currentScenario, userMessage);
         addMessage('bot', botResponse);
@@ -297,6 +324,33 @@ async function sendMessage(userMessage) {
     }
 }
 
+// Read a text/event-stream response body, calling onEvent(event, data) per event
+async function readServerSentEvents(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            
+            let event = 'message';
+            let data = '';
+            rawEvent.split('\n').forEach(line => {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) data += line.slice(5).trim();
+            });
+            if (data) onEvent(event, JSON.parse(data));
+        }
+    }
+}
+
 // Fallback responses (if backend is unavailable)
 function getFallbackResponse(scenario, userMessage) {
     const responses = {
@@ -355,6 +409,25 @@ function addMessage(sender, text) {
     });
 }
 
+// Add an empty bot message that is filled in while the reply streams
+function addStreamingMessage() {
+    const chatContainer = document.getElementById('chat-container');
+    const messageDiv = document.createElement('div');
+    messageDiv.className = 'chat-message bot';
+    messageDiv.innerHTML = `
+        <div class="message-content">
+            <div class="message-header">
+                <i class="fas fa-robot"></i>
+                <span>AI Assistant</span>
+            </div>
+            <div class="message-text"></div>
+        </div>
+    `;
+    chatContainer.appendChild(messageDiv);
+    chatContainer.scrollTop = chatContainer.scrollHeight;
+    return messageDiv;
+}
+
 // Text to Speech
 function speakText(text) {
     if (!synthesis) {
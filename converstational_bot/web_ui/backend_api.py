@@ -3,10 +3,11 @@ Flask Backend API for Web UI
 Connects the HTML/CSS/JS frontend with the Python conversational bot.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import sys
 import os
+import json
 from pathlib import Path
 
 # Add parent directory to path to import bot modules
@@ -80,6 +81,47 @@ def generate_response():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _sse(event, payload):
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+@app.route('/api/generate_response/stream', methods=['POST'])
+def generate_response_stream():
+    """
+    Stream a response to user input as Server-Sent Events: one `token` event per
+    text chunk, then a `done` event with the full response and the turn count.
+    """
+    global conversation_manager
+    
+    if not conversation_manager:
+        return jsonify({'error': 'Conversation not started'}), 400
+    
+    data = request.json
+    user_message = data.get('user_message')
+    
+    if not user_message:
+        return jsonify({'error': 'User message is required'}), 400
+    
+    manager = conversation_manager
+    
+    def events():
+        # If the client disconnects, closing this generator also closes the LLM stream
+        chunks = []
+        try:
+            for chunk in manager.generate_response_stream(user_message):
+                chunks.append(chunk)
+                yield _sse('token', {'text': chunk})
+            yield _sse('done', {
+                'success': True,
+                'response': ''.join(chunks).strip(),
+                'turn_count': len([msg for msg in manager.conversation_history if msg['speaker'] == 'user'])
+            })
+        except Exception as e:
+            yield _sse('error', {'error': str(e)})
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/generate_report', methods=['POST'])
 def generate_report():
     """Generate conversation analysis report."""
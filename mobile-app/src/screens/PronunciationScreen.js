@@ -70,7 +70,8 @@ export default function PronunciationScreen() {
     }
   };
 
-  const playBase64Audio = async (base64Audio, audioId) => {
+  // Clips can be MP3 or WAV depending on the server's TTS backend; older servers only sent MP3
+  const playBase64Audio = async (base64Audio, audioId, mimeType = 'audio/mpeg') => {
     try {
       console.log('Attempting to play audio:', audioId);
       console.log('Base64 length:', base64Audio?.length);
@@ -106,7 +107,7 @@ export default function PronunciationScreen() {
       
       // Play new audio
       const { sound } = await Audio.Sound.createAsync(
-        { uri: `data:audio/mp3;base64,${base64Audio}` },
+        { uri: `data:${mimeType};base64,${base64Audio}` },
         { shouldPlay: true, volume: 1.0 },
         (status) => {
           console.log('Playback status:', status);
@@ -208,7 +209,7 @@ export default function PronunciationScreen() {
               styles.audioButton,
               playingAudio === `${cardId}-full` && isPlaying && styles.audioButtonPlaying,
             ]}
-            onPress={() => playBase64Audio(wordData.full_audio_base64, `${cardId}-full`)}
+            onPress={() => playBase64Audio(wordData.full_audio_base64, `${cardId}-full`, wordData.full_audio_mime_type)}
           >
             <Text style={styles.audioIcon}>
               {playingAudio === `${cardId}-full` && isPlaying ? '⏸️' : '▶️'}
@@ -239,7 +240,7 @@ export default function PronunciationScreen() {
                       styles.syllableAudioButton,
                       playingAudio === `${cardId}-${index}` && isPlaying && styles.syllableAudioButtonPlaying,
                     ]}
-                    onPress={() => playBase64Audio(syllable.audio_base64, `${cardId}-${index}`)}
+                    onPress={() => playBase64Audio(syllable.audio_base64, `${cardId}-${index}`, syllable.audio_mime_type)}
                   >
                     <Text style={styles.syllableAudioIcon}>
                       {playingAudio === `${cardId}-${index}` && isPlaying ? '⏸️' : '▶️'}
@@ -0,0 +1,55 @@
+"""
+Akshara (orthographic syllable) segmentation for Devanagari and Telugu.
+
+The character-class tables below are compiled once, at import time, into a
+single regular expression, so segmentation is one left-to-right pass in
+the regex engine. An akshara is a base (a consonant cluster, an
+independent vowel, or any other character) followed by everything that
+attaches to it: dependent vowel signs, nuktas, viramas and
+anusvara/visarga. Consonants only join a cluster across a virama, which
+keeps conjuncts such as "स्व" or "త్ర్య" in one piece.
+"""
+
+import re
+
+OTHER, VOWEL, CONSONANT, MATRA, NUKTA, VIRAMA, MODIFIER, ZWJ, ZWNJ = range(9)
+
+_DEVANAGARI = {
+    VOWEL: [(0x0904, 0x0914), (0x0960, 0x0961), (0x0972, 0x0977)],
+    CONSONANT: [(0x0915, 0x0939), (0x0958, 0x095F), (0x0978, 0x097F)],
+    MATRA: [(0x093A, 0x093B), (0x093E, 0x094C), (0x094E, 0x094F), (0x0955, 0x0957), (0x0962, 0x0963)],
+    NUKTA: [(0x093C, 0x093C)],
+    VIRAMA: [(0x094D, 0x094D)],
+    MODIFIER: [(0x0900, 0x0903)],
+}
+_TELUGU = {
+    VOWEL: [(0x0C05, 0x0C14), (0x0C60, 0x0C61)],
+    CONSONANT: [(0x0C15, 0x0C39), (0x0C58, 0x0C5A), (0x0C5D, 0x0C5D)],
+    MATRA: [(0x0C3E, 0x0C4C), (0x0C55, 0x0C56), (0x0C62, 0x0C63)],
+    NUKTA: [(0x0C3C, 0x0C3C)],
+    VIRAMA: [(0x0C4D, 0x0C4D)],
+    MODIFIER: [(0x0C00, 0x0C04)],
+}
+_JOINERS = {ZWJ: [(0x200D, 0x200D)], ZWNJ: [(0x200C, 0x200C)]}
+
+
+def _char_class(cls):
+    return "[" + "".join(
+        re.escape(chr(lo)) + ("-" + re.escape(chr(hi)) if hi > lo else "")
+        for script in (_DEVANAGARI, _TELUGU, _JOINERS) for lo, hi in script.get(cls, [])
+    ) + "]"
+
+
+_C, _V, _M, _N, _H, _D = (_char_class(c) for c in (CONSONANT, VOWEL, MATRA, NUKTA, VIRAMA, MODIFIER))
+_J, _JN = _char_class(ZWJ), _char_class(ZWNJ)
+
+_AKSHARA_RE = re.compile(
+    rf"(?:{_C}{_N}?(?:{_H}{_J}?{_C}{_N}?)*|{_V}{_N}?|.)"  # base: consonant cluster, vowel or anything else
+    rf"(?:{_M}|{_N}|{_H}|{_D}|{_J}|{_JN})*",              # attached signs
+    re.DOTALL,
+)
+
+
+def segment_aksharas(word):
+    """Split `word` into aksharas."""
+    return _AKSHARA_RE.findall(word)
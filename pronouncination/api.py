@@ -1,20 +1,44 @@
 # FILE: api.py
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List
 from main import PronunciationAssistant
+from breakdown_pool import BreakdownPool
+from response_cache import ResponseCache
+from lexicon_snapshot import SNAPSHOT_VERSION
+import worker_pool
+import metrics
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import random
 import os
 import base64
+import hashlib
+import json
+import re
+import time
+import config
+
+# Cold-start reference point: time to the first successful /breakdown is logged from here
+_process_started = time.perf_counter()
+_first_breakdown_logged = False
 
 # --- API App Initialization ---
 app = FastAPI(
     title="Trilingual Pronunciation API",
-    description="Get phonetic breakdowns with embedded audio for English, Hindi, and Telugu words.",
-    version="2.2.0",
+    description="Get phonetic breakdowns with audio for English, Hindi, and Telugu words.",
+    version="2.3.0",
 )
 
 # --- Core Logic and Data ---
 assistant = PronunciationAssistant()
 
+# Dedicated pool for CPU-bound work so it never competes with Starlette's threadpool
+cpu_executor = ThreadPoolExecutor(max_workers=config.CPU_WORKERS, thread_name_prefix="cpu")
+# Caps in-flight breakdowns; extra requests wait on the event loop, not in a thread
+breakdown_slots = asyncio.Semaphore(config.MAX_CONCURRENT_BREAKDOWNS)
+
 ENGLISH_WORDS = [
     "ubiquitous", "ephemeral", "mellifluous", "serendipity", "cacophony",
     "quintessential", "plethora", "idiosyncratic", "magnanimous", "ostentatious",
@@ -31,61 +55,296 @@ TELUGU_WORDS = [
     "ప్రజాస్వామ్యం", "విద్యార్థి", "పుస్తకం", "సంగీతం", "రాజ్యాంగం"
 ]
 
+# Serialized /breakdown bodies; a hit skips the breakdown and JSON encoding
+response_cache = ResponseCache(config.RESPONSE_CACHE_MAX_BYTES, assistant.audio_cache)
+# Anything that can change a breakdown for the same word; part of every /breakdown ETag
+ENGINE_VERSION = "|".join([
+    app.version, str(SNAPSHOT_VERSION), config.TTS_BACKEND,
+    config.TTS_LANGUAGE_BACKENDS, config.TTS_FALLBACK_BACKEND, config.SYLLABLE_AUDIO_MODE,
+])
+
+# Ready breakdowns for /random-words, refreshed in the background
+random_word_pool = BreakdownPool(
+    assistant,
+    {"english": ENGLISH_WORDS, "hindi": HINDI_WORDS, "telugu": TELUGU_WORDS},
+    config.RANDOM_WORDS_REFRESH_SECONDS,
+    cpu_executor,
+)
+
 
-def _process_breakdown_for_api(breakdown_data):
+def _process_breakdown_for_api(breakdown_data, audio_url_for, inline_audio=False):
     """
-    Helper function to convert all audio paths in the breakdown data to Base64.
+    Helper function to replace the server-side clip paths in the breakdown data with
+    audio URLs, plus Base64 copies of every clip when `inline_audio` is set (for
+    clients that cannot fetch URLs). Clips may be MP3 or WAV depending on the TTS
+    backend, so each Base64 copy comes with its MIME type.
     """
-    full_audio_path = breakdown_data.get("full_audio_path")
-    if full_audio_path and os.path.exists(full_audio_path):
-        with open(full_audio_path, "rb") as f:
-            audio_bytes = f.read()
-            breakdown_data["full_audio_base64"] = base64.b64encode(audio_bytes).decode("utf-8")
-    
-    if "syllables" in breakdown_data:
-        for syl in breakdown_data["syllables"]:
-            syl_audio_path = syl.get("audio_path")
-            if syl_audio_path and os.path.exists(syl_audio_path):
-                with open(syl_audio_path, "rb") as f:
-                    syl_audio_bytes = f.read()
-                    syl["audio_base64"] = base64.b64encode(syl_audio_bytes).decode("utf-8")
+    def attach(target, path, prefix):
+        if not path: return
+        target[f"{prefix}_url"] = audio_url_for(os.path.basename(path))
+        if inline_audio and os.path.exists(path):
+            with metrics.timed("base64_encoding", breakdown_data.get("language", "unknown")):
+                with open(path, "rb") as f:
+                    target[f"{prefix}_base64"] = base64.b64encode(f.read()).decode("utf-8")
+            target[f"{prefix}_mime_type"] = AUDIO_MEDIA_TYPES[path.rpartition(".")[2]]
+
+    attach(breakdown_data, breakdown_data.pop("full_audio_path", None), "full_audio")
+    for syl in breakdown_data.get("syllables", []):
+        attach(syl, syl.pop("audio_path", None), "audio")
     return breakdown_data
 
+
+def _audio_url_builder(request):
+    return lambda filename: str(request.url_for("get_audio_clip", filename=filename))
+
+
+async def _to_api_result(raw_result, request, inline_audio):
+    audio_url_for = _audio_url_builder(request)
+    if not inline_audio:
+        return _process_breakdown_for_api(raw_result, audio_url_for)
+    # Reading and encoding clips is blocking work; keep it off the event loop
+    return await asyncio.get_running_loop().run_in_executor(
+        cpu_executor, _process_breakdown_for_api, raw_result, audio_url_for, True
+    )
+
+
+async def _breakdown_for_api(word, request, inline_audio=False):
+    """Return the API result for `word` and the clip paths it links to (None for missing clips)."""
+    global _first_breakdown_logged
+    started = time.perf_counter()
+    async with breakdown_slots:
+        raw_result = await assistant.breakdown_word_async(word, cpu_executor)
+        audio_paths = _linked_audio_paths(raw_result)
+        api_result = await _to_api_result(raw_result, request, inline_audio)
+    metrics.observe("total", api_result.get("language", "unknown"), time.perf_counter() - started)
+    if not _first_breakdown_logged:
+        _first_breakdown_logged = True
+        print(f"Cold start: first breakdown served {time.perf_counter() - _process_started:.2f}s after api import")
+    return api_result, audio_paths
+
+
+async def _random_word_for_api(language, words, request, inline_audio=False):
+    raw_result = random_word_pool.pick(language)
+    if raw_result is None:
+        # Pool still warming up: fall back to a live breakdown
+        api_result, _ = await _breakdown_for_api(random.choice(words), request, inline_audio)
+        return api_result
+    return await _to_api_result(raw_result, request, inline_audio)
+
+
+def _breakdown_etag(body):
+    """Tag of a serialized breakdown; clips are content-addressed, so equal results hash equally."""
+    digest = hashlib.sha256(ENGINE_VERSION.encode("utf-8") + b"\0" + body)
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def _etag_matches(request, etag):
+    tags = [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _linked_audio_paths(raw_result):
+    return [raw_result.get("full_audio_path")] + [syl.get("audio_path") for syl in raw_result.get("syllables", [])]
+
+
+def _warm_words():
+    return ENGLISH_WORDS + _load_warm_vocabulary(config.WARM_VOCABULARY_PATH)
+
+
+def _load_warm_vocabulary(path):
+    if not path: return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    except OSError as e:
+        print(f"Could not read warm-up vocabulary '{path}': {e}")
+        return []
+
+
+AUDIO_FILE_RE = re.compile(r"([0-9a-f]{64})\.(mp3|wav)")
+AUDIO_MEDIA_TYPES = {"mp3": "audio/mpeg", "wav": "audio/wav"}
+AUDIO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class BatchBreakdownRequest(BaseModel):
+    words: List[str] = Field(..., min_length=1, max_length=config.MAX_BATCH_WORDS,
+                             description="Words to analyze (English, Hindi, or Telugu).")
+
 # --- API Endpoints ---
 @app.get("/")
 def read_root():
     return {"message": "Welcome! Go to /docs for API documentation."}
 
 
+@app.on_event("startup")
+async def warm_memo_caches():
+    if not config.WARM_CACHES_ON_STARTUP: return
+    words = _warm_words()
+    # Runs in the background so the server accepts requests while warming
+    asyncio.get_running_loop().run_in_executor(cpu_executor, assistant.warm_caches, words)
+
+
+@app.on_event("startup")
+async def start_random_word_pool():
+    if config.PREWARM_RANDOM_WORDS:
+        random_word_pool.start()
+
+
+@app.on_event("startup")
+async def start_process_pool():
+    if config.CPU_PROCESS_WORKERS > 0:
+        # Workers have their own memo tables, so they get the same warm-up as the parent
+        warm_words = _warm_words() if config.WARM_CACHES_ON_STARTUP else ()
+        # Built off the event loop: the parent loads (or builds) the shared snapshot first
+        assistant.process_pool = await asyncio.get_running_loop().run_in_executor(
+            None, worker_pool.create_pool, config.CPU_PROCESS_WORKERS, assistant, warm_words
+        )
+
+
+@app.on_event("shutdown")
+async def close_clients():
+    await random_word_pool.stop()
+    await assistant.aclose()
+    cpu_executor.shutdown(wait=False)
+    if assistant.process_pool is not None:
+        assistant.process_pool.shutdown(wait=False, cancel_futures=True)
+
+
 @app.get("/breakdown")
-def get_specific_word_breakdown(
-    word: str = Query(..., description="The word to analyze (English, Hindi, or Telugu).")
+async def get_specific_word_breakdown(
+    request: Request,
+    word: str = Query(..., description="The word to analyze (English, Hindi, or Telugu)."),
+    inline_audio: bool = Query(False, description="Also embed every clip as Base64 (legacy clients).")
 ):
     """
-    Provides a pronunciation breakdown with embedded Base64 audio for any word.
+    Provides a pronunciation breakdown with audio URLs (or embedded Base64 audio) for any word.
+    Complete responses carry an ETag derived from the body and engine version and honour
+    If-None-Match; responses with missing clips are sent without an ETag and must not be stored.
     """
-    try:
-        raw_result = assistant.breakdown_word(word.strip())
-        api_response = _process_breakdown_for_api(raw_result)
-        return api_response
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"An error occurred: {e}")
+    word = word.strip()
+    # The base URL is part of the key because the body embeds absolute audio URLs
+    key = (word.lower(), inline_audio, str(request.base_url))
+    cached = response_cache.get(key)
+    if cached:
+        body, etag = cached
+    else:
+        try:
+            api_result, audio_paths = await _breakdown_for_api(word, request, inline_audio)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"An error occurred: {e}")
+        body = json.dumps(api_result, ensure_ascii=False).encode("utf-8")
+        if None in audio_paths:
+            # A retry may produce the missing clips, so this body must never be revalidated
+            return Response(content=body, media_type="application/json", headers={"Cache-Control": "no-store"})
+        etag = _breakdown_etag(body)
+        response_cache.put(key, body, etag, audio_paths)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.post("/breakdown/batch")
+async def get_batch_breakdown(
+    batch: BatchBreakdownRequest,
+    request: Request,
+    inline_audio: bool = Query(False, description="Also embed every clip as Base64 (legacy clients).")
+):
+    """
+    Breaks down a list of words and streams one JSON object per unique word
+    (NDJSON) as each finishes. Shared syllable clips are synthesized only once.
+    """
+    async def ndjson_lines():
+        async with breakdown_slots:
+            try:
+                async for raw_result in assistant.breakdown_batch_async(batch.words, cpu_executor):
+                    api_result = await _to_api_result(raw_result, request, inline_audio)
+                    yield json.dumps(api_result, ensure_ascii=False) + "\n"
+            except Exception as e:
+                # Headers are already sent, so report the failure in-band
+                yield json.dumps({"error": f"An error occurred: {e}"}) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
 
 @app.get("/random-words")
-def get_random_words_of_the_day():
+async def get_random_words_of_the_day(
+    request: Request,
+    inline_audio: bool = Query(False, description="Also embed every clip as Base64 (legacy clients).")
+):
     """
     Provides a set of three random words (EN, HI, TE) with their breakdowns.
     """
     try:
-        en_result = assistant.breakdown_word(random.choice(ENGLISH_WORDS))
-        hi_result = assistant.breakdown_word(random.choice(HINDI_WORDS))
-        te_result = assistant.breakdown_word(random.choice(TELUGU_WORDS))
+        en_result, hi_result, te_result = await asyncio.gather(
+            _random_word_for_api("english", ENGLISH_WORDS, request, inline_audio),
+            _random_word_for_api("hindi", HINDI_WORDS, request, inline_audio),
+            _random_word_for_api("telugu", TELUGU_WORDS, request, inline_audio),
+        )
 
         return {
-            "english": _process_breakdown_for_api(en_result),
-            "hindi": _process_breakdown_for_api(hi_result),
-            "telugu": _process_breakdown_for_api(te_result)
+            "english": en_result,
+            "hindi": hi_result,
+            "telugu": te_result
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"An error occurred: {e}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"An error occurred: {e}")
+
+
+@app.get("/audio/{filename}", name="get_audio_clip")
+def get_audio_clip(filename: str, request: Request):
+    """
+    Streams a synthesized clip by its content hash. Clips never change for a
+    given hash, so they are served as immutable with a hash-based ETag.
+    Range requests are supported for seeking.
+    """
+    match = AUDIO_FILE_RE.fullmatch(filename)
+    # Counts as a use of the clip, so clips only fetched here are not evicted first
+    path = assistant.audio_cache.touch(match.group(1)) if match else None
+    if not path or not path.endswith(filename):
+        raise HTTPException(status_code=404, detail="Audio clip not found")
+    key = match.group(1)
+    headers = {"Cache-Control": AUDIO_CACHE_CONTROL, "ETag": f'"{key}"'}
+    if _etag_matches(request, f'"{key}"'):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=AUDIO_MEDIA_TYPES[match.group(2)], headers=headers)
+
+
+@app.get("/cache/stats")
+def get_cache_stats():
+    """
+    Hit/miss counters for the TTS audio cache, the G2P / syllabification memo
+    tables and the /breakdown response cache, plus the fill level of the
+    /random-words pool. With CPU_PROCESS_WORKERS the workers' memo tables are
+    reported, summed, as g2p_workers / syllables_workers.
+    """
+    return {
+        "audio": assistant.audio_cache.stats(),
+        **assistant.memo_stats(),
+        **worker_pool.memo_stats(),
+        "responses": response_cache.stats(),
+        "random_words": random_word_pool.stats(),
+    }
+
+
+def _cache_metrics():
+    caches = {"audio": assistant.audio_cache.stats(), **assistant.memo_stats(), **worker_pool.memo_stats(),
+              "responses": response_cache.stats()}
+    return [
+        ("pronunciation_cache_hit_ratio", "gauge", "Hit ratio of the audio cache and memo tables.",
+         [({"cache": name}, stats["hit_ratio"]) for name, stats in caches.items()]),
+        ("pronunciation_cache_hits_total", "counter", "Cache hits since process start.",
+         [({"cache": name}, stats["hits"]) for name, stats in caches.items()]),
+        ("pronunciation_cache_misses_total", "counter", "Cache misses since process start.",
+         [({"cache": name}, stats["misses"]) for name, stats in caches.items()]),
+    ]
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Per-stage latency histograms (labelled by stage and language) and cache
+    hit ratios in Prometheus text exposition format.
+    """
+    return PlainTextResponse(metrics.render_prometheus(_cache_metrics()),
+                             media_type="text/plain; version=0.0.4")
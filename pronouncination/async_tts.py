@@ -0,0 +1,61 @@
+"""
+Async Google TTS client.
+
+gTTS only ships a blocking requests-based sender. We let gTTS build the
+request bodies (text tokenization, RPC packaging) and send them ourselves
+over a shared httpx.AsyncClient, so TTS waits do not occupy a thread.
+"""
+
+import asyncio
+import base64
+import re
+
+import httpx
+from gtts import gTTS, gTTSError
+
+_AUDIO_RE = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+
+class AsyncGTTS:
+    def __init__(self, timeout, max_connections, tld="com"):
+        self.url = f"https://translate.google.{tld}/_/TranslateWebserverUi/data/batchexecute"
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client = None
+        self._slots = None
+
+    def _get_client(self):
+        # Created lazily so the client binds to the running event loop
+        if self._client is None:
+            # Callers queue on self._slots, so the per-call timeout never covers
+            # waiting for a pooled connection
+            self._slots = asyncio.Semaphore(self.max_connections)
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, pool=None),
+                headers=gTTS.GOOGLE_TTS_HEADERS,
+                limits=httpx.Limits(max_connections=self.max_connections),
+            )
+        return self._client
+
+    async def synthesize(self, text, lang="en"):
+        """Return MP3 bytes for `text`; raises gTTSError on upstream failure."""
+        tts = gTTS(text=text, lang=lang, slow=False, lang_check=False)
+        client = self._get_client()
+        audio = bytearray()
+        async with self._slots:
+            for body in tts.get_bodies():
+                try:
+                    response = await client.post(self.url, content=body)
+                    response.raise_for_status()
+                except httpx.HTTPError as e:
+                    raise gTTSError(f"TTS request failed for '{text}' ({lang}): {e}")
+                match = _AUDIO_RE.search(response.text)
+                if not match:
+                    raise gTTSError(f"No audio in TTS response for '{text}' ({lang})")
+                audio += base64.b64decode(match.group(1).encode("ascii"))
+        return bytes(audio)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,202 @@
+"""
+Content-addressed, disk-budgeted store for synthesized TTS audio.
+
+Clips are stored as <sha256(voice, lang, text)>.<format>, where voice names
+the TTS backend (or derivation) that produced the clip, so identical
+requests never collide or resynthesize. Files are sharded into
+<key[:2]>/<key[2:4]>/ subdirectories and written via atomic rename, so a
+reader never sees a partial clip. A background garbage collector keeps
+the store under a byte budget (least recently used first) and drops clips
+not used within the age budget.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+AUDIO_FORMATS = ("mp3", "wav")
+
+
+class AudioCache:
+    def __init__(self, cache_dir, max_bytes, max_age_seconds=0, gc_interval=60):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.gc_interval = gc_interval
+        self.hits = 0
+        self.misses = 0
+        self.size_evictions = 0
+        self.age_evictions = 0
+        self.gc_runs = 0
+        self.last_gc_seconds = 0.0
+        self._lock = threading.Lock()
+        # key -> (size in bytes, format, last used), ordered from least to most recently used
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_existing()
+        self.collect()
+
+        self._gc_wake = threading.Event()
+        self._gc_stop = threading.Event()
+        self._gc_thread = None
+        if gc_interval > 0:
+            self._gc_thread = threading.Thread(target=self._gc_loop, name="audio-gc", daemon=True)
+            self._gc_thread.start()
+
+    def _load_existing(self):
+        """
+        Rebuild the LRU order from files left over by a previous run. Leftover
+        temp files are removed and clips from the old flat layout are moved
+        into their shard.
+        """
+        found = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                key, _, fmt = name.partition(".")
+                if fmt not in AUDIO_FORMATS or len(key) != 64:
+                    if name.endswith(".tmp"): self._remove(path)
+                    continue
+                try:
+                    st = os.stat(path)
+                    if path != self.path_for(key, fmt):
+                        os.makedirs(os.path.dirname(self.path_for(key, fmt)), exist_ok=True)
+                        os.replace(path, self.path_for(key, fmt))
+                except OSError:
+                    continue
+                found.append((st.st_mtime, key, st.st_size, fmt))
+        for mtime, key, size, fmt in sorted(found):
+            self._entries[key] = (size, fmt, mtime)
+            self._total_bytes += size
+
+    @staticmethod
+    def key_for(text, lang, voice):
+        return hashlib.sha256(f"{voice}\0{lang}\0{text}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def key_from_path(path):
+        return os.path.basename(path).partition(".")[0]
+
+    def path_for(self, key, fmt):
+        return os.path.join(self.cache_dir, key[:2], key[2:4], f"{key}.{fmt}")
+
+    def touch(self, key):
+        """
+        Mark a stored clip as just used (LRU position and age) and return its path,
+        or None if it has been evicted. Does not count as a hit or miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None: return None
+            size, fmt, _ = entry
+            path = self.path_for(key, fmt)
+            if not os.path.exists(path): return None
+            self._entries[key] = (size, fmt, time.time())
+            self._entries.move_to_end(key)
+        return path
+
+    def get(self, text, lang, voice):
+        """Return the cached clip path for (text, lang, voice), or None on a miss."""
+        key = self.key_for(text, lang, voice)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                size, fmt, _ = entry
+                path = self.path_for(key, fmt)
+                if os.path.exists(path):
+                    self._entries[key] = (size, fmt, time.time())
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return path
+                del self._entries[key]
+                self._total_bytes -= size
+            self.misses += 1
+        return None
+
+    def put(self, text, lang, voice, audio_bytes, fmt):
+        """Store a clip atomically and return its path."""
+        key = self.key_for(text, lang, voice)
+        path = self.path_for(key, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio_bytes)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[0]
+            self._entries[key] = (len(audio_bytes), fmt, time.time())
+            self._total_bytes += len(audio_bytes)
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget and self._gc_thread is not None:
+            self._gc_wake.set()
+        return path
+
+    def collect(self):
+        """One GC pass: drop clips past the age budget, then LRU clips over the size budget."""
+        start = time.perf_counter()
+        now = time.time()
+        victims = []
+        with self._lock:
+            while self._entries:
+                key, (size, fmt, last_used) = next(iter(self._entries.items()))
+                if self.max_age_seconds and now - last_used > self.max_age_seconds:
+                    self.age_evictions += 1
+                elif self._total_bytes > self.max_bytes:
+                    self.size_evictions += 1
+                else:
+                    break
+                del self._entries[key]
+                self._total_bytes -= size
+                victims.append(self.path_for(key, fmt))
+        # Unlink outside the lock; readers that already opened a clip keep their handle
+        for path in victims:
+            self._remove(path)
+        with self._lock:
+            self.gc_runs += 1
+            self.last_gc_seconds = time.perf_counter() - start
+        return len(victims)
+
+    def _gc_loop(self):
+        while not self._gc_stop.is_set():
+            self._gc_wake.wait(self.gc_interval)
+            self._gc_wake.clear()
+            if self._gc_stop.is_set(): break
+            try:
+                self.collect()
+            except Exception as e:
+                print(f"Audio cache GC failed: {e}")
+
+    def close(self):
+        self._gc_stop.set()
+        self._gc_wake.set()
+        if self._gc_thread is not None:
+            self._gc_thread.join(timeout=5)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.size_evictions + self.age_evictions,
+                "size_evictions": self.size_evictions,
+                "age_evictions": self.age_evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "max_age_seconds": self.max_age_seconds,
+                "gc_runs": self.gc_runs,
+                "last_gc_ms": round(self.last_gc_seconds * 1000, 3),
+            }
@@ -0,0 +1,57 @@
+"""
+Benchmark: akshara segmentation throughput for Hindi and Telugu.
+
+Builds a synthetic corpus by recombining aksharas from sample words (so it
+contains conjuncts, nuktas and vowel signs), then measures words per second
+for akshara.segment_aksharas and for the old per-call regexes.
+
+Usage:
+    python benchmark_akshara.py [--words 200000]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from akshara import segment_aksharas
+
+SAMPLES = {
+    "hindi": ["नमस्ते", "धन्यवाद", "कंप्यूटर", "अविश्वसनीय", "स्वतंत्रता", "प्रौद्योगिकी", "क़िला", "ज़िंदगी"],
+    "telugu": ["నమస్కారం", "స్వాతంత్ర్యం", "ప్రజాస్వామ్యం", "విద్యార్థి", "కంప్యూటర్", "సంస్కృతి"],
+}
+
+LEGACY = {
+    "hindi": lambda w: re.findall(r'[ऀ-ॿ][ऻ-्ॢॣ]*', w) or [w],
+    "telugu": lambda w: re.findall(r'[ఀ-౿][ా-ౖ]*', w) or [w],
+}
+
+
+def build_corpus(language, n_words, seed=0):
+    rng = random.Random(seed)
+    pieces = [a for w in SAMPLES[language] for a in segment_aksharas(w)]
+    return ["".join(rng.choices(pieces, k=rng.randint(2, 6))) for _ in range(n_words)]
+
+
+def _words_per_second(func, corpus):
+    start = time.perf_counter()
+    for word in corpus:
+        func(word)
+    return len(corpus) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=200000)
+    args = parser.parse_args()
+
+    for language in SAMPLES:
+        corpus = build_corpus(language, args.words)
+        table = _words_per_second(segment_aksharas, corpus)
+        legacy = _words_per_second(LEGACY[language], corpus)
+        print(f"{language:<7} table-driven {table:>12,.0f} words/s   legacy regex {legacy:>12,.0f} words/s")
+        print(f"        e.g. {corpus[0]} -> {segment_aksharas(corpus[0])}")
+
+
+if __name__ == "__main__":
+    main()
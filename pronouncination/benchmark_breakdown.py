@@ -0,0 +1,55 @@
+"""
+Benchmark: end-to-end breakdown latency.
+
+Runs PronunciationAssistant.breakdown_word over a word list with a cold and
+then a warm audio cache. Uses the offline "tone" TTS backend by default so
+results do not depend on Google's servers; pass --backend gtts to measure
+the network path.
+
+Usage:
+    python benchmark_breakdown.py [--backend tone] [--words ubiquitous नमस्ते ...]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+DEFAULT_WORDS = ["ubiquitous", "ephemeral", "pulchritudinous", "नमस्ते", "स्वतंत्रता", "నమస్కారం", "స్వాతంత్ర్యం"]
+
+
+def _run(assistant, words):
+    timings = []
+    for word in words:
+        start = time.perf_counter()
+        assistant.breakdown_word(word)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(label, timings):
+    timings = sorted(timings)
+    print(f"{label:<6} mean={sum(timings) / len(timings) * 1000:9.2f} ms  "
+          f"p50={timings[len(timings) // 2] * 1000:9.2f} ms  max={timings[-1] * 1000:9.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="tone")
+    parser.add_argument("--words", nargs="+", default=DEFAULT_WORDS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # config reads the environment at import time
+        os.environ.update(TTS_BACKEND=args.backend, TTS_FALLBACK_BACKEND="", AUDIO_CACHE_DIR=cache_dir)
+        from main import PronunciationAssistant
+
+        assistant = PronunciationAssistant()
+        assistant.warm_up()
+        _report("cold", _run(assistant, args.words))
+        _report("warm", _run(assistant, args.words))
+        print(assistant.audio_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
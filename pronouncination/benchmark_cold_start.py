@@ -0,0 +1,65 @@
+"""
+Benchmark: cold start time to the first successful /breakdown.
+
+Each run is a fresh interpreter that imports the API, then serves one
+/breakdown through FastAPI's TestClient. Runs are repeated with the
+lexicon snapshot in place (the normal case for workers and reloads) and
+with an empty snapshot directory (first boot, snapshot gets built).
+
+Usage:
+    python lexicon_snapshot.py                 # make sure a snapshot exists
+    python benchmark_cold_start.py [--runs 3] [--word hello]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+import api
+from fastapi.testclient import TestClient
+imported = time.perf_counter()
+response = TestClient(api.app).get("/breakdown", params={"word": sys.argv[1]})
+response.raise_for_status()
+done = time.perf_counter()
+print(json.dumps({"import_s": imported - start, "first_breakdown_s": done - start}))
+"""
+
+
+def _run_once(word, env):
+    here = os.path.dirname(os.path.abspath(__file__))
+    out = subprocess.run([sys.executable, "-c", CHILD, word], cwd=here, env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _report(label, runs):
+    imports = [r["import_s"] for r in runs]
+    firsts = [r["first_breakdown_s"] for r in runs]
+    print(f"{label:<18} import mean={sum(imports) / len(imports):6.2f}s  "
+          f"first /breakdown mean={sum(firsts) / len(firsts):6.2f}s  min={min(firsts):6.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--word", default="hello")
+    args = parser.parse_args()
+
+    # Offline deterministic TTS, so the numbers do not depend on Google's servers
+    env = dict(os.environ, TTS_BACKEND="tone", TTS_FALLBACK_BACKEND="")
+    _report("with snapshot", [_run_once(args.word, env) for _ in range(args.runs)])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cold_env = dict(env, LEXICON_SNAPSHOT_DIR=os.path.join(tmp, "lexicon"),
+                        SIMPLE_WORD_INDEX_PATH=os.path.join(tmp, "index.json"))
+        _report("building snapshot", [_run_once(args.word, cold_env)])
+
+
+if __name__ == "__main__":
+    main()
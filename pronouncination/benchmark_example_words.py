@@ -0,0 +1,72 @@
+"""
+Benchmark: per-syllable latency of the example-word lookup.
+
+Compares the old linear cmudict scan against the precomputed phoneme index
+used by PronunciationAssistant._find_simple_english_word, and times the
+vectorized nearest-neighbour fallback used when there is no exact match.
+
+Usage:
+    python benchmark_example_words.py [--words ubiquitous ephemeral ...] [--legacy-limit 3]
+"""
+
+import argparse
+import time
+
+from main import PronunciationAssistant
+
+DEFAULT_WORDS = ["ubiquitous", "ephemeral", "serendipity", "cacophony", "plethora"]
+
+
+def legacy_find_simple_english_word(assistant, syllable):
+    """The pre-index implementation: walks every cmudict entry per syllable."""
+    syllable_phonemes_base = [p.strip('012') for p in assistant.g2p_en(syllable)]
+    for word, phonemes in assistant.cmu_dict_en:
+        if len(assistant._get_english_syllables(word)) == 1 and word.isalpha():
+            if [p.strip('012') for p in phonemes] == syllable_phonemes_base:
+                return word
+    return syllable
+
+
+def _time_per_call(func, syllables):
+    timings = []
+    for syl in syllables:
+        start = time.perf_counter()
+        func(syl)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(label, timings):
+    timings = sorted(timings)
+    mean = sum(timings) / len(timings)
+    print(f"{label:<10} n={len(timings):<4} mean={mean * 1000:10.3f} ms  "
+          f"p50={timings[len(timings) // 2] * 1000:10.3f} ms  max={timings[-1] * 1000:10.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", nargs="+", default=DEFAULT_WORDS)
+    parser.add_argument("--legacy-limit", type=int, default=3,
+                        help="Number of syllables to run through the slow legacy scan")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    assistant = PronunciationAssistant()
+    print(f"Assistant ready in {time.perf_counter() - start:.2f}s "
+          f"({len(assistant.simple_word_index)} indexed phoneme keys)")
+
+    syllables = [s for w in args.words for s in assistant._get_english_syllables(w)]
+    # Warm the G2P model so both variants are measured without its first-call cost
+    assistant.g2p_en(syllables[0])
+
+    _report("legacy", _time_per_call(lambda s: legacy_find_simple_english_word(assistant, s),
+                                     syllables[:args.legacy_limit]))
+    _report("indexed", _time_per_call(assistant._find_simple_english_word, syllables))
+
+    search = assistant.phonetic_search
+    keys = [assistant._phoneme_key(assistant._phonemize(s)).split() for s in syllables]
+    _report("nearest", _time_per_call(search.nearest, keys))
+
+
+if __name__ == "__main__":
+    main()
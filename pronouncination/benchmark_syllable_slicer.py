@@ -0,0 +1,70 @@
+"""
+Benchmark: syllable segmentation of a synthesized word.
+
+Times the vectorized energy segmenter in syllable_slicer against a plain
+Python frame loop doing the same RMS computation, on synthetic words made
+of tone bursts separated by short gaps (no network or MP3 decoding needed).
+
+Usage:
+    python benchmark_syllable_slicer.py [--repeat 200]
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+import syllable_slicer
+
+SAMPLE_RATE = 24000
+
+
+def synthetic_word(n_syllables, sample_rate=SAMPLE_RATE, seed=0):
+    rng = np.random.default_rng(seed)
+    parts = [np.zeros(int(sample_rate * 0.05), dtype=np.int16)]
+    for _ in range(n_syllables):
+        duration = rng.uniform(0.12, 0.25)
+        t = np.arange(int(sample_rate * duration)) / sample_rate
+        envelope = np.sin(np.pi * t / duration)
+        parts.append((np.sin(2 * np.pi * rng.uniform(120, 300) * t) * envelope * 9000).astype(np.int16))
+        parts.append((rng.normal(0, 80, int(sample_rate * rng.uniform(0.02, 0.06)))).astype(np.int16))
+    return np.concatenate(parts)
+
+
+def python_frame_energy(samples, sample_rate, frame_ms=syllable_slicer.FRAME_MS):
+    """Reference: per-frame RMS with Python loops."""
+    hop = sample_rate * frame_ms // 1000
+    values = samples.tolist()
+    energy = []
+    for start in range(0, len(values) - hop + 1, hop):
+        total = 0.0
+        for v in values[start:start + hop]:
+            total += v * v
+        energy.append(math.sqrt(total / hop))
+    return energy
+
+
+def _time(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'syllables':>9} {'audio':>8} {'vectorized':>12} {'python loop':>12}")
+    for n in (2, 4, 6, 8):
+        samples = synthetic_word(n)
+        weights = [1] * n
+        vectorized = _time(lambda: syllable_slicer.slice_syllables(samples, SAMPLE_RATE, weights), args.repeat)
+        loop = _time(lambda: python_frame_energy(samples, SAMPLE_RATE), max(1, args.repeat // 20))
+        print(f"{n:>9} {len(samples) / SAMPLE_RATE:>7.2f}s {vectorized * 1e3:>10.3f}ms {loop * 1e3:>10.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Background pool of ready-made breakdowns for the /random-words widget.
+
+Every word in the pool is broken down ahead of time and refreshed on a
+schedule, so serving a random word is a constant-time pick that never
+touches TTS on the request path.
+"""
+
+import asyncio
+import copy
+import random
+
+
+class BreakdownPool:
+    def __init__(self, assistant, words_by_language, refresh_seconds, cpu_executor=None):
+        self.assistant = assistant
+        self.words_by_language = words_by_language
+        self.refresh_seconds = refresh_seconds
+        self.cpu_executor = cpu_executor
+        self.refreshes = 0
+        # language -> {word: raw breakdown}; lists are rebuilt for O(1) random picks
+        self._ready = {language: {} for language in words_by_language}
+        self._choices = {language: [] for language in words_by_language}
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_forever(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Error refreshing random-word pool: {e}")
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def refresh(self):
+        for language, words in self.words_by_language.items():
+            async for result in self.assistant.breakdown_batch_async(words, self.cpu_executor):
+                # Keep the previous entry unless this round synthesized every clip of the word
+                if all(self._clip_paths(result)) or result["word"] not in self._ready[language]:
+                    self._ready[language][result["word"]] = result
+            self._choices[language] = list(self._ready[language].values())
+        self.refreshes += 1
+
+    @staticmethod
+    def _clip_paths(result):
+        return [result["full_audio_path"]] + [syl["audio_path"] for syl in result["syllables"]]
+
+    def _clips_available(self, result):
+        """
+        True if every clip of `result` is still in the audio store. Also refreshes
+        their LRU position, so pooled clips are not the first to be evicted.
+        """
+        audio_cache = self.assistant.audio_cache
+        for path in filter(None, self._clip_paths(result)):
+            if audio_cache.touch(audio_cache.key_from_path(path)) is None:
+                return False
+        return True
+
+    def pick(self, language):
+        """A copy of a random ready breakdown for `language`, or None if none are ready yet."""
+        choices = self._choices[language]
+        while choices:
+            result = random.choice(choices)
+            if self._clips_available(result):
+                return copy.deepcopy(result)
+            # Its clips were garbage-collected; drop it until the next refresh rebuilds it
+            del self._ready[language][result["word"]]
+            choices = self._choices[language] = list(self._ready[language].values())
+        return None
+
+    def stats(self):
+        return {
+            "refreshes": self.refreshes,
+            "ready": {language: len(choices) for language, choices in self._choices.items()},
+        }
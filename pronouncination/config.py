@@ -0,0 +1,76 @@
+"""
+Configuration settings for the Pronunciation API
+"""
+
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Example-word lookup
+# Prebuilt phoneme -> one-syllable example word index. Built from cmudict on
+# first start if the file does not exist yet.
+SIMPLE_WORD_INDEX_PATH = os.getenv(
+    "SIMPLE_WORD_INDEX_PATH", os.path.join(BASE_DIR, "cmu_simple_index.json")
+)
+
+# TTS audio cache
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", os.path.join(BASE_DIR, "audio_output"))
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+# Clips unused for this long are deleted (0 disables the age budget)
+AUDIO_CACHE_MAX_AGE_SECONDS = float(os.getenv("AUDIO_CACHE_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+# Seconds between background GC passes; a pass also runs as soon as the byte budget is exceeded
+AUDIO_CACHE_GC_INTERVAL = float(os.getenv("AUDIO_CACHE_GC_INTERVAL", "60"))
+
+# Concurrent TTS synthesis
+TTS_MAX_WORKERS = int(os.getenv("TTS_MAX_WORKERS", "8"))
+# Seconds a breakdown waits for its clips; missing clips are returned as null
+TTS_REQUEST_TIMEOUT = float(os.getenv("TTS_REQUEST_TIMEOUT", "10"))
+
+# Async request path
+# Upper bound on simultaneous connections to the TTS service
+TTS_MAX_CONNECTIONS = int(os.getenv("TTS_MAX_CONNECTIONS", "64"))
+# Breakdowns allowed to run at once; further requests wait for a slot
+MAX_CONCURRENT_BREAKDOWNS = int(os.getenv("MAX_CONCURRENT_BREAKDOWNS", "256"))
+# Threads for g2p / syllabification / example-word lookups
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Serialized /breakdown responses kept in memory (0 disables the cache)
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Batch breakdowns
+MAX_BATCH_WORDS = int(os.getenv("MAX_BATCH_WORDS", "500"))
+# Seconds a whole batch waits for its clips; missing clips are returned as null
+TTS_BATCH_TIMEOUT = float(os.getenv("TTS_BATCH_TIMEOUT", "60"))
+
+# Memory-mapped CMU lexicon snapshot (see lexicon_snapshot.py)
+LEXICON_SNAPSHOT_DIR = os.getenv("LEXICON_SNAPSHOT_DIR", os.path.join(BASE_DIR, "lexicon_snapshot"))
+# Memory-mapped copy of the G2P model weights, shared by worker processes
+G2P_WEIGHTS_DIR = os.getenv("G2P_WEIGHTS_DIR", os.path.join(LEXICON_SNAPSHOT_DIR, "g2p"))
+
+# G2P / syllabification memo tables
+G2P_CACHE_SIZE = int(os.getenv("G2P_CACHE_SIZE", "50000"))
+SYLLABLE_CACHE_SIZE = int(os.getenv("SYLLABLE_CACHE_SIZE", "50000"))
+WARM_CACHES_ON_STARTUP = os.getenv("WARM_CACHES_ON_STARTUP", "True").lower() == "true"
+# Optional file with one word per line ('#' comments allowed) to warm at startup
+WARM_VOCABULARY_PATH = os.getenv("WARM_VOCABULARY_PATH", "")
+
+# Syllable audio: "per_syllable" synthesizes each syllable with its own TTS call,
+# "slice" synthesizes the word once and cuts it into WAV syllable clips
+SYLLABLE_AUDIO_MODE = os.getenv("SYLLABLE_AUDIO_MODE", "per_syllable")
+
+# /random-words pre-computation pool
+PREWARM_RANDOM_WORDS = os.getenv("PREWARM_RANDOM_WORDS", "True").lower() == "true"
+RANDOM_WORDS_REFRESH_SECONDS = float(os.getenv("RANDOM_WORDS_REFRESH_SECONDS", "3600"))
+
+# TTS backends: "gtts" (network), "espeak" (offline, needs espeak-ng) or "tone"
+# (deterministic stand-in for tests and benchmarks)
+TTS_BACKEND = os.getenv("TTS_BACKEND", "gtts")
+# Per-language overrides, e.g. "te=espeak,hi=gtts"
+TTS_LANGUAGE_BACKENDS = os.getenv("TTS_LANGUAGE_BACKENDS", "")
+# Used when the configured backend fails or times out; empty disables fallback
+TTS_FALLBACK_BACKEND = os.getenv("TTS_FALLBACK_BACKEND", "espeak")
+# Per-call timeout for a backend, kept below TTS_REQUEST_TIMEOUT so the fallback has time to run
+TTS_NETWORK_TIMEOUT = float(os.getenv("TTS_NETWORK_TIMEOUT", "4"))
+
+# Worker processes for G2P / example-word lookups (0 keeps them on CPU_WORKERS threads)
+CPU_PROCESS_WORKERS = int(os.getenv("CPU_PROCESS_WORKERS", "0"))
@@ -0,0 +1,151 @@
+"""
+Compact, memory-mappable snapshot of the CMU pronouncing dictionary.
+
+The snapshot is a directory of flat .npy arrays (words as UTF-8 bytes plus
+offsets, phonemes as small integer ids plus offsets, the pyphen syllable
+count of every entry, and an alphabetical order for word lookups). Loading it with mmap_mode='r' is close to
+free, and every process that maps the same files shares the same physical
+pages, so uvicorn workers no longer each parse and hold their own copy of
+cmudict.
+
+Usage:
+    python lexicon_snapshot.py            # (re)build at config.LEXICON_SNAPSHOT_DIR
+"""
+
+import bisect
+import json
+import os
+import threading
+
+import numpy as np
+
+SNAPSHOT_VERSION = 2
+_ARRAYS = ("word_bytes", "word_offsets", "phoneme_ids", "phoneme_offsets", "syllable_counts", "sorted_order")
+
+
+class LexiconSnapshot:
+    def __init__(self, arrays, symbols):
+        self.word_bytes = arrays["word_bytes"]
+        self.word_offsets = arrays["word_offsets"]
+        self.phoneme_ids = arrays["phoneme_ids"]
+        self.phoneme_offsets = arrays["phoneme_offsets"]
+        self.syllable_counts = arrays["syllable_counts"]
+        self.sorted_order = arrays["sorted_order"]
+        self.symbols = symbols
+
+    def __len__(self):
+        return len(self.syllable_counts)
+
+    def word(self, i):
+        return bytes(self.word_bytes[self.word_offsets[i]:self.word_offsets[i + 1]]).decode("utf-8")
+
+    def phonemes(self, i):
+        ids = self.phoneme_ids[self.phoneme_offsets[i]:self.phoneme_offsets[i + 1]]
+        return [self.symbols[j] for j in ids]
+
+    def entries(self):
+        """Yield (word, phonemes) pairs in cmudict order, like cmudict.entries()."""
+        for i in range(len(self)):
+            yield self.word(i), self.phonemes(i)
+
+    def pronunciations(self, word):
+        """All pronunciations of `word`, found by binary search over the sorted order."""
+        sorted_words = _SortedWords(self)
+        lo = bisect.bisect_left(sorted_words, word)
+        hi = bisect.bisect_right(sorted_words, word, lo)
+        return [self.phonemes(self.sorted_order[i]) for i in range(lo, hi)]
+
+    def as_dict(self):
+        """Read-only mapping with the same shape as cmudict.dict(), backed by the snapshot."""
+        return PronunciationMap(self)
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported lexicon snapshot version {meta.get('version')}")
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in _ARRAYS}
+        return cls(arrays, meta["symbols"])
+
+    @staticmethod
+    def build(entries, syllable_count, directory):
+        """Write a snapshot of `entries` ((word, phonemes) pairs) to `directory`."""
+        symbol_ids = {}
+        words, word_chunks, phoneme_chunks = [], [], []
+        word_offsets, phoneme_offsets, syllable_counts = [0], [0], []
+        for word, phonemes in entries:
+            words.append(word)
+            encoded = word.encode("utf-8")
+            word_chunks.append(encoded)
+            word_offsets.append(word_offsets[-1] + len(encoded))
+            phoneme_chunks.extend(symbol_ids.setdefault(p, len(symbol_ids)) for p in phonemes)
+            phoneme_offsets.append(len(phoneme_chunks))
+            syllable_counts.append(min(syllable_count(word), 255))
+
+        arrays = {
+            "word_bytes": np.frombuffer(b"".join(word_chunks), dtype=np.uint8),
+            "word_offsets": np.asarray(word_offsets, dtype=np.int64),
+            "phoneme_ids": np.asarray(phoneme_chunks, dtype=np.uint8),
+            "phoneme_offsets": np.asarray(phoneme_offsets, dtype=np.int64),
+            "syllable_counts": np.asarray(syllable_counts, dtype=np.uint8),
+            # Stable sort keeps variant pronunciations of a word in cmudict order
+            "sorted_order": np.asarray(sorted(range(len(words)), key=words.__getitem__), dtype=np.int64),
+        }
+        os.makedirs(directory, exist_ok=True)
+        # Several workers may build at once on first boot; each writes its own temp
+        # files and the (identical) results replace each other atomically
+        tmp_suffix = f"{os.getpid()}.{threading.get_ident()}.tmp"
+        for name, array in arrays.items():
+            tmp_path = os.path.join(directory, f"{name}.{tmp_suffix}.npy")
+            np.save(tmp_path, array)
+            os.replace(tmp_path, os.path.join(directory, f"{name}.npy"))
+        # meta.json goes last: its presence marks a complete snapshot
+        symbols = sorted(symbol_ids, key=symbol_ids.get)
+        tmp_meta = os.path.join(directory, f"meta.json.{tmp_suffix}")
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({"version": SNAPSHOT_VERSION, "entries": len(syllable_counts), "symbols": symbols}, f)
+        os.replace(tmp_meta, os.path.join(directory, "meta.json"))
+
+
+
+class _SortedWords:
+    """Sequence view of the snapshot's words in sorted order, for bisect."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __len__(self):
+        return len(self.snapshot.sorted_order)
+
+    def __getitem__(self, i):
+        return self.snapshot.word(self.snapshot.sorted_order[i])
+
+
+class PronunciationMap:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __contains__(self, word):
+        return bool(self.snapshot.pronunciations(word))
+
+    def __getitem__(self, word):
+        prons = self.snapshot.pronunciations(word)
+        if not prons: raise KeyError(word)
+        return prons
+
+    def get(self, word, default=None):
+        return self.snapshot.pronunciations(word) or default
+
+
+if __name__ == "__main__":
+    import time
+
+    import config
+    from main import PronunciationAssistant
+
+    start = time.perf_counter()
+    assistant = PronunciationAssistant()
+    LexiconSnapshot.build(assistant._cmudict_entries(), assistant._count_english_syllables,
+                          config.LEXICON_SNAPSHOT_DIR)
+    print(f"Lexicon snapshot written to {config.LEXICON_SNAPSHOT_DIR} in {time.perf_counter() - start:.2f}s")
@@ -1,23 +1,126 @@
 # FILE: main.py
 import os
 import pyphen
-from g2p_en import G2p
-from gtts import gTTS
-import nltk
 import re
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+import json
+import numpy as np
+import config
+from audio_cache import AudioCache
+from tts_backends import build_backend, parse_language_backends
+from lexicon_snapshot import LexiconSnapshot
+import syllable_slicer
+from akshara import segment_aksharas
+from phonetic_search import PhoneticSearch
+from shared_g2p import create_shared_g2p
+import worker_pool
+from metrics import observe, timed
 
-try:
-    nltk.data.find('corpora/cmudict.zip')
-except nltk.downloader.DownloadError:
-    nltk.download('cmudict')
+LANGUAGE_CODES = {'english': 'en', 'hindi': 'hi', 'telugu': 'te'}
+LANGUAGE_NAMES = {code: name for name, code in LANGUAGE_CODES.items()}
+
+
+def _ensure_nltk_resource(resource_path, package):
+    import nltk
+    try:
+        nltk.data.find(resource_path)
+    except LookupError:
+        nltk.download(package)
 
-from nltk.corpus import cmudict
 
 class PronunciationAssistant:
-    def __init__(self):
+    """
+    The G2P model, the CMU lexicon and the example-word index are loaded lazily
+    on first use, so importing this module (and uvicorn reloads) stay cheap.
+    """
+
+    def __init__(self, with_audio=True):
+        """`with_audio=False` skips the audio store and TTS setup (used by CPU worker processes)."""
         self.syllable_dic_en = pyphen.Pyphen(lang='en_US')
-        self.g2p_en = G2p()
-        self.cmu_dict_en = cmudict.entries()
+        self._load_lock = threading.RLock()
+        self._g2p_en = None
+        self._cmu_lexicon = None
+        self._simple_word_index = None
+        self._phonetic_search = None
+        # Bounded memo tables; the G2P model is the slowest step for unseen syllables
+        self._phonemize = functools.lru_cache(maxsize=config.G2P_CACHE_SIZE)(self._phonemize_uncached)
+        self._syllabify = functools.lru_cache(maxsize=config.SYLLABLE_CACHE_SIZE)(self._syllabify_uncached)
+        # Optional process pool (see worker_pool.py) that takes over example-word lookups
+        self.process_pool = None
+        self.tts_backends = {}
+        if not with_audio: return
+        self.audio_cache = AudioCache(
+            config.AUDIO_CACHE_DIR, config.AUDIO_CACHE_MAX_BYTES,
+            config.AUDIO_CACHE_MAX_AGE_SECONDS, config.AUDIO_CACHE_GC_INTERVAL,
+        )
+        self.tts_executor = ThreadPoolExecutor(max_workers=config.TTS_MAX_WORKERS, thread_name_prefix="tts")
+        self._tts_chains = self._build_tts_chains()
+
+    # --- Lazily loaded resources ---
+
+    @property
+    def g2p_en(self):
+        if self._g2p_en is None:
+            with self._load_lock:
+                if self._g2p_en is None:
+                    self._g2p_en = create_shared_g2p(self.cmu_lexicon, config.G2P_WEIGHTS_DIR)
+        return self._g2p_en
+
+    @property
+    def cmu_lexicon(self):
+        """Memory-mapped CMU snapshot, built from nltk's cmudict the first time."""
+        if self._cmu_lexicon is None:
+            with self._load_lock:
+                if self._cmu_lexicon is None:
+                    self._cmu_lexicon = self._load_cmu_lexicon()
+        return self._cmu_lexicon
+
+    @property
+    def cmu_dict_en(self):
+        return self.cmu_lexicon.entries()
+
+    @property
+    def simple_word_index(self):
+        if self._simple_word_index is None:
+            with self._load_lock:
+                if self._simple_word_index is None:
+                    self._simple_word_index = self._load_simple_word_index()
+        return self._simple_word_index
+
+    @property
+    def phonetic_search(self):
+        """Edit-distance search over the example-word index, for syllables with no exact match."""
+        if self._phonetic_search is None:
+            with self._load_lock:
+                if self._phonetic_search is None:
+                    self._phonetic_search = PhoneticSearch(self.simple_word_index)
+        return self._phonetic_search
+
+    def warm_up(self):
+        """Load every lazy resource now instead of on the first request."""
+        return self.g2p_en, self.cmu_lexicon, self.simple_word_index, self.phonetic_search
+
+    def _cmudict_entries(self):
+        _ensure_nltk_resource('corpora/cmudict.zip', 'cmudict')
+        from nltk.corpus import cmudict
+        return cmudict.entries()
+
+    def _count_english_syllables(self, word):
+        # Used for bulk snapshot builds, so it bypasses the request-path memo table
+        return len(self._syllabify_uncached(word))
+
+    def _load_cmu_lexicon(self, directory=None):
+        directory = directory or config.LEXICON_SNAPSHOT_DIR
+        try:
+            return LexiconSnapshot.load(directory)
+        except (OSError, ValueError) as e:
+            print(f"No usable lexicon snapshot at '{directory}' ({e}), building one")
+        LexiconSnapshot.build(self._cmudict_entries(), self._count_english_syllables, directory)
+        return LexiconSnapshot.load(directory)
 
     def _detect_language(self, word):
         if re.search(r'[\u0900-\u097F]', word):
@@ -27,59 +130,346 @@ class PronunciationAssistant:
         return 'english'
 
     def _get_hindi_aksharas(self, word):
-        return re.findall(r'[\u0900-\u097F][\u093B-\u094D\u0962\u0963]*', word) or [word]
-        
+        return segment_aksharas(word) or [word]
+
     def _get_telugu_aksharas(self, word):
-        return re.findall(r'[\u0c00-\u0c7f][\u0c3e-\u0c56]*', word) or [word]
+        return segment_aksharas(word) or [word]
+
+    def _syllabify_uncached(self, word):
+        return tuple(self.syllable_dic_en.inserted(word).split('-'))
+
+    def _phonemize_uncached(self, text):
+        return tuple(self.g2p_en(text))
 
     def _get_english_syllables(self, word):
-        return self.syllable_dic_en.inserted(word).split('-')
+        return list(self._syllabify(word))
+
+    def warm_caches(self, words):
+        """Pre-fill the syllabification and G2P memo tables for `words`."""
+        for word in words:
+            word = word.lower().strip()
+            if not word or self._detect_language(word) != 'english': continue
+            for syllable in self._syllabify(word):
+                self._phonemize(syllable)
+
+    def memo_stats(self):
+        stats = {}
+        for name, memo in (("g2p", self._phonemize), ("syllables", self._syllabify)):
+            info = memo.cache_info()
+            lookups = info.hits + info.misses
+            stats[name] = {
+                "hits": info.hits,
+                "misses": info.misses,
+                "hit_ratio": round(info.hits / lookups, 4) if lookups else 0.0,
+                "entries": info.currsize,
+                "max_entries": info.maxsize,
+            }
+        return stats
+
+    @staticmethod
+    def _phoneme_key(phonemes):
+        """Stress-stripped phoneme sequence used as the example-word index key."""
+        return " ".join(p.strip('012') for p in phonemes)
+
+    def _build_simple_word_index(self):
+        """
+        Single pass over cmudict mapping each stress-stripped phoneme sequence to
+        the first one-syllable alphabetic word that produces it.
+        """
+        lexicon = self.cmu_lexicon
+        index = {}
+        # Syllable counts are precomputed in the snapshot, so only one-syllable entries are visited
+        for i in np.flatnonzero(lexicon.syllable_counts == 1):
+            key = self._phoneme_key(lexicon.phonemes(i))
+            if key in index: continue
+            word = lexicon.word(i)
+            if word.isalpha():
+                index[key] = word
+        return index
+
+    def _load_simple_word_index(self, path=None):
+        """Load the prebuilt example-word index, building and saving it if missing."""
+        path = path or config.SIMPLE_WORD_INDEX_PATH
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Could not read example-word index '{path}', rebuilding: {e}")
+        index = self._build_simple_word_index()
+        try:
+            # Unique per writer: several workers may build the index at once on first boot
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not save example-word index '{path}': {e}")
+        return index
 
     def _find_simple_english_word(self, syllable):
-        # ... (this logic remains the same)
         pre_selected = {'tion': 'nation', 'pro': 'promote'}
         if syllable.lower() in pre_selected: return pre_selected[syllable.lower()]
         try:
-            syllable_phonemes = self.g2p_en(syllable)
-            syllable_phonemes_base = [p.strip('012') for p in syllable_phonemes]
-            for word, phonemes in self.cmu_dict_en:
-                if len(self._get_english_syllables(word)) == 1 and word.isalpha():
-                    phonemes_base = [p.strip('012') for p in phonemes]
-                    if phonemes_base == syllable_phonemes_base: return word
+            with timed("g2p", "english"):
+                syllable_key = self._phoneme_key(self._phonemize(syllable))
         except Exception: return None
-        return syllable
+        with timed("cmu_lookup", "english"):
+            exact = self.simple_word_index.get(syllable_key)
+            if exact: return exact
+            return self.phonetic_search.nearest(syllable_key.split()) or syllable
+
+    # --- Text to speech ---
+
+    def _build_tts_chains(self):
+        """Per-language list of backends to try in order: the configured one, then the fallback."""
+        language_backends = parse_language_backends(config.TTS_LANGUAGE_BACKENDS)
+
+        def backend(name):
+            if name not in self.tts_backends:
+                self.tts_backends[name] = build_backend(name, config.TTS_NETWORK_TIMEOUT, config.TTS_MAX_CONNECTIONS)
+            return self.tts_backends[name]
+
+        chains = {}
+        for lang in ('en', 'hi', 'te'):
+            chain = [backend(language_backends.get(lang, config.TTS_BACKEND))]
+            fallback_name = config.TTS_FALLBACK_BACKEND
+            if fallback_name and fallback_name != chain[0].name:
+                fallback = backend(fallback_name)
+                if getattr(fallback, "available", True):
+                    chain.append(fallback)
+                else:
+                    print(f"TTS fallback '{fallback_name}' is not available; '{lang}' has no fallback")
+            chains[lang] = chain
+        return chains
 
-    def generate_audio(self, text, filepath, lang='en'):
+    def _tts_chain(self, lang):
+        return self._tts_chains.get(lang) or self._tts_chains['en']
+
+    def generate_audio(self, text, lang='en'):
+        """
+        Return the path of a clip for (text, lang), synthesizing it only on a cache miss.
+        Backends are tried in order, so the fallback only runs when the primary fails.
+        """
+        for backend in self._tts_chain(lang):
+            cached_path = self.audio_cache.get(text, lang, backend.name)
+            if cached_path: return cached_path
+            try:
+                with timed("tts", LANGUAGE_NAMES.get(lang, lang)):
+                    audio_bytes, fmt = backend.synthesize(text, lang)
+                return self.audio_cache.put(text, lang, backend.name, audio_bytes, fmt)
+            except Exception as e:
+                print(f"Error generating audio for '{text}' with lang '{lang}' ({backend.name}): {e}")
+        return None
+
+    def _submit_synthesis(self, texts, lang_code):
+        """Queue one TTS job per unique text on the shared worker pool."""
+        futures = {}
+        for text in texts:
+            if text not in futures:
+                futures[text] = self.tts_executor.submit(self.generate_audio, text, lang_code)
+        return futures
+
+    def _collect_synthesis(self, futures, texts, deadline):
+        """
+        Wait until `deadline` (time.monotonic()) for queued clips and return their
+        paths in the order of `texts`. Clips that fail or miss the deadline are None.
+        """
+        done, not_done = wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+        if not_done:
+            print(f"TTS timed out for {len(not_done)} of {len(futures)} clips")
+        paths = {}
+        for text, future in futures.items():
+            paths[text] = future.result() if future in done and future.exception() is None else None
+        return [paths[text] for text in texts]
+
+    @staticmethod
+    def _use_slicing(components):
+        return config.SYLLABLE_AUDIO_MODE == "slice" and len(components) > 1
+
+    def _slice_syllable_audio(self, word, components, lang_code, full_audio_path):
+        """
+        Cut the full-word clip into one WAV per syllable instead of synthesizing
+        each syllable separately. Slices are cached per (word, position).
+        """
+        slice_keys = [f"{word}#{i}:{comp}" for i, comp in enumerate(components)]
+        voice = f"slice:{os.path.basename(full_audio_path)}" if full_audio_path else "slice"
+        paths = [self.audio_cache.get(key, lang_code, voice) for key in slice_keys]
+        if all(paths) or not full_audio_path: return paths
         try:
-            tts = gTTS(text=text, lang=lang, slow=False)
-            tts.save(filepath)
+            with open(full_audio_path, "rb") as f:
+                wavs = syllable_slicer.slice_to_wavs(f.read(), components)
         except Exception as e:
-            print(f"Error generating audio for '{text}' with lang '{lang}': {e}")
+            print(f"Error slicing audio for '{word}': {e}")
+            return [None] * len(components)
+        return [self.audio_cache.put(key, lang_code, voice, wav, "wav") for key, wav in zip(slice_keys, wavs)]
 
-    def breakdown_word(self, word):
+    def _split_word(self, word):
+        """Normalize a word and split it into syllables / aksharas for its language."""
         word = word.lower().strip()
-        output_dir = "audio_output"
-        os.makedirs(output_dir, exist_ok=True)
-        
+        started = time.perf_counter()
         lang_name = self._detect_language(word)
-        lang_code_map = {'english': 'en', 'hindi': 'hi', 'telugu': 'te'}
-        lang_code = lang_code_map.get(lang_name, 'en')
-        
-        safe_filename = "".join(c for c in word if c.isalnum() or c in (' ', '_')).rstrip()
-        full_audio_path = os.path.join(output_dir, f"{safe_filename}.mp3")
-        self.generate_audio(word, full_audio_path, lang=lang_code)
+        observe("language_detection", lang_name, time.perf_counter() - started)
+        lang_code = LANGUAGE_CODES.get(lang_name, 'en')
 
-        result = {"word": word, "language": lang_name, "full_audio_path": full_audio_path, "syllables": []}
+        with timed("syllabification", lang_name):
+            if lang_name == 'english': components = self._get_english_syllables(word)
+            elif lang_name == 'hindi': components = self._get_hindi_aksharas(word)
+            elif lang_name == 'telugu': components = self._get_telugu_aksharas(word)
+            else: components = [word]
+        return word, lang_name, lang_code, components
 
-        if lang_name == 'english': components = self._get_english_syllables(word)
-        elif lang_name == 'hindi': components = self._get_hindi_aksharas(word)
-        elif lang_name == 'telugu': components = self._get_telugu_aksharas(word)
-        else: components = [word]
+    def _example_words(self, lang_name, components):
+        return [self._find_simple_english_word(comp) if lang_name == 'english' else "N/A" for comp in components]
 
-        for i, comp in enumerate(components):
-            comp_audio_path = os.path.join(output_dir, f"{lang_code}_{safe_filename}_{i}.mp3")
-            self.generate_audio(comp, comp_audio_path, lang=lang_code)
-            example_word = self._find_simple_english_word(comp) if lang_name == 'english' else "N/A"
+    @staticmethod
+    def _build_result(word, lang_name, components, audio_paths, example_words):
+        full_audio_path, *component_paths = audio_paths
+        result = {"word": word, "language": lang_name, "full_audio_path": full_audio_path, "syllables": []}
+        for comp, comp_audio_path, example_word in zip(components, component_paths, example_words):
             result["syllables"].append({"text": comp, "audio_path": comp_audio_path, "example_word_sound": example_word})
-            
         return result
+
+    def breakdown_word(self, word):
+        word, lang_name, lang_code, components = self._split_word(word)
+
+        # Start all TTS round trips at once, then do the CPU-side lookups while they run
+        slicing = self._use_slicing(components)
+        texts = [word] if slicing else [word] + components
+        deadline = time.monotonic() + config.TTS_REQUEST_TIMEOUT
+        futures = self._submit_synthesis(texts, lang_code)
+        example_words = self._example_words(lang_name, components)
+        audio_paths = self._collect_synthesis(futures, texts, deadline)
+        if slicing:
+            audio_paths += self._slice_syllable_audio(word, components, lang_code, audio_paths[0])
+        return self._build_result(word, lang_name, components, audio_paths, example_words)
+
+    # --- Async request path (used by the FastAPI endpoints) ---
+
+    async def generate_audio_async(self, text, lang='en'):
+        """Async counterpart of generate_audio; network backends hold no thread while waiting."""
+        for backend in self._tts_chain(lang):
+            cached_path = self.audio_cache.get(text, lang, backend.name)
+            if cached_path: return cached_path
+            try:
+                with timed("tts", LANGUAGE_NAMES.get(lang, lang)):
+                    audio_bytes, fmt = await backend.synthesize_async(text, lang)
+                return await asyncio.to_thread(self.audio_cache.put, text, lang, backend.name, audio_bytes, fmt)
+            except Exception as e:
+                print(f"Error generating audio for '{text}' with lang '{lang}' ({backend.name}): {e}")
+        return None
+
+    async def _example_words_async(self, lang_name, components, cpu_executor=None):
+        """Example-word lookups on the worker process pool if there is one, else on `cpu_executor`."""
+        loop = asyncio.get_running_loop()
+        if lang_name == 'english' and components and self.process_pool is not None:
+            # Per-syllable G2P / lookup timings come back with the result; time the round trip here
+            with timed("example_words_process_pool", lang_name):
+                words, pid, memo_stats, histograms = await loop.run_in_executor(
+                    self.process_pool, worker_pool.example_words, components
+                )
+            worker_pool.record_stats(pid, memo_stats, histograms)
+            return words
+        return await loop.run_in_executor(cpu_executor, self._example_words, lang_name, components)
+
+    async def aclose(self):
+        for backend in self.tts_backends.values():
+            await backend.aclose()
+        if hasattr(self, "audio_cache"):
+            self.audio_cache.close()
+
+    async def _synthesize_all_async(self, texts, lang_code, timeout):
+        """Synthesize unique texts concurrently; clips missing the timeout are None."""
+        tasks = {}
+        for text in texts:
+            if text not in tasks:
+                tasks[text] = asyncio.create_task(self.generate_audio_async(text, lang_code))
+        done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            print(f"TTS timed out for {len(pending)} of {len(tasks)} clips")
+        paths = {text: task.result() if task in done else None for text, task in tasks.items()}
+        return [paths[text] for text in texts]
+
+    async def breakdown_word_async(self, word, cpu_executor=None):
+        """
+        Same result as breakdown_word. CPU-bound work (g2p, example-word lookup)
+        runs on `cpu_executor` while the TTS requests are awaited on the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        word, lang_name, lang_code, components = await loop.run_in_executor(cpu_executor, self._split_word, word)
+        slicing = self._use_slicing(components)
+        texts = [word] if slicing else [word] + components
+        tts = asyncio.create_task(self._synthesize_all_async(texts, lang_code, config.TTS_REQUEST_TIMEOUT))
+        example_words = await self._example_words_async(lang_name, components, cpu_executor)
+        audio_paths = await tts
+        if slicing:
+            audio_paths += await loop.run_in_executor(
+                cpu_executor, self._slice_syllable_audio, word, components, lang_code, audio_paths[0]
+            )
+        return self._build_result(word, lang_name, components, audio_paths, example_words)
+
+    async def breakdown_batch_async(self, words, cpu_executor=None, timeout=None):
+        """
+        Break down many words at once, yielding each result as soon as its clips
+        are ready. Repeated words are processed once, and clips shared between
+        words (same syllable text and language) are synthesized only once.
+        """
+        loop = asyncio.get_running_loop()
+        timeout = config.TTS_BATCH_TIMEOUT if timeout is None else timeout
+        deadline = loop.time() + timeout
+        unique_words = list(dict.fromkeys(w.lower().strip() for w in words if w and w.strip()))
+
+        # Only this many clips are in flight; the rest wait here, bounded by the batch deadline alone
+        clip_slots = asyncio.Semaphore(config.TTS_MAX_CONNECTIONS)
+
+        async def synthesize_clip(text, lang_code):
+            async with clip_slots:
+                return await self.generate_audio_async(text, lang_code)
+
+        clip_tasks = {}
+        # English syllable -> (lookup task, index in its result); the first word containing it looks it up
+        example_lookups = {}
+
+        def lookup_examples(lang_name, components):
+            if lang_name != 'english': return
+            new = [comp for comp in dict.fromkeys(components) if comp not in example_lookups]
+            if not new: return
+            lookup = asyncio.create_task(self._example_words_async(lang_name, new, cpu_executor))
+            example_lookups.update((comp, (lookup, i)) for i, comp in enumerate(new))
+
+        async def example_word(lang_name, comp):
+            if lang_name != 'english': return "N/A"
+            lookup, i = example_lookups[comp]
+            # Shielded: the lookup may be shared with words that are still waiting on it
+            return (await asyncio.shield(lookup))[i]
+
+        # Each word is split, looked up and finished on its own, so CPU work spreads
+        # across the executor and early words stream out before later ones are split
+        async def finish(word):
+            word, lang_name, lang_code, components = await loop.run_in_executor(cpu_executor, self._split_word, word)
+            slicing = self._use_slicing(components)
+            tasks = []
+            for text in [word] if slicing else [word] + components:
+                if (text, lang_code) not in clip_tasks:
+                    clip_tasks[(text, lang_code)] = asyncio.create_task(synthesize_clip(text, lang_code))
+                tasks.append(clip_tasks[(text, lang_code)])
+            lookup_examples(lang_name, components)
+            example_words = [await example_word(lang_name, comp) for comp in components]
+            await asyncio.wait(tasks, timeout=max(0.0, deadline - loop.time()))
+            audio_paths = [t.result() if t.done() and not t.cancelled() else None for t in tasks]
+            if slicing:
+                audio_paths += await loop.run_in_executor(
+                    cpu_executor, self._slice_syllable_audio, word, components, lang_code, audio_paths[0]
+                )
+            return self._build_result(word, lang_name, components, audio_paths, example_words)
+
+        try:
+            for next_result in asyncio.as_completed([finish(word) for word in unique_words]):
+                yield await next_result
+        finally:
+            for task in clip_tasks.values():
+                task.cancel()
+            for lookup, _ in example_lookups.values():
+                lookup.cancel()
@@ -0,0 +1,91 @@
+"""
+Minimal latency histograms exposed in Prometheus text format.
+
+    with timed("tts", "english"):
+        ...
+
+Each (stage, language) pair gets cumulative buckets plus _sum and _count,
+rendered by render_prometheus() for the /metrics endpoint. Worker processes
+report their own histograms with snapshot(); the parent stores them with
+set_remote() and sums them into the rendered series.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_METRIC = "pronunciation_stage_seconds"
+
+_lock = threading.Lock()
+# (stage, language) -> [per-bucket counts (+ overflow), sum, count]
+_histograms = {}
+# source (worker pid) -> the snapshot() it reported last
+_remote = {}
+
+
+def observe(stage, language, seconds):
+    index = bisect.bisect_left(BUCKETS, seconds)
+    with _lock:
+        hist = _histograms.get((stage, language))
+        if hist is None:
+            hist = _histograms[(stage, language)] = [[0] * (len(BUCKETS) + 1), 0.0, 0]
+        hist[0][index] += 1
+        hist[1] += seconds
+        hist[2] += 1
+
+
+@contextmanager
+def timed(stage, language):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, language, time.perf_counter() - start)
+
+
+def snapshot():
+    """Copy of this process's histograms: (stage, language) -> (counts, sum, count)."""
+    with _lock:
+        return {key: (list(h[0]), h[1], h[2]) for key, h in _histograms.items()}
+
+
+def set_remote(source, histograms):
+    """Replace the histograms last reported by `source`, e.g. a worker process."""
+    with _lock:
+        _remote[source] = histograms
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+
+
+def render_prometheus(extra=()):
+    """
+    Render all stage histograms, followed by `extra` metrics:
+    an iterable of (name, type, help, [(labels dict, value), ...]).
+    """
+    merged = snapshot()
+    with _lock:
+        remotes = list(_remote.values())
+    for histograms in remotes:
+        for key, (counts, total, count) in histograms.items():
+            own = merged.get(key, ([0] * (len(BUCKETS) + 1), 0.0, 0))
+            merged[key] = ([a + b for a, b in zip(own[0], counts)], own[1] + total, own[2] + count)
+    lines = [f"# HELP {STAGE_METRIC} Time spent in each breakdown stage.",
+             f"# TYPE {STAGE_METRIC} histogram"]
+    for (stage, language), (counts, total, count) in sorted(merged.items()):
+        cumulative = 0
+        for bound, n in zip(BUCKETS, counts):
+            cumulative += n
+            lines.append(f"{STAGE_METRIC}_bucket{_labels(stage=stage, language=language, le=bound)} {cumulative}")
+        lines.append(f"{STAGE_METRIC}_bucket{_labels(stage=stage, language=language, le='+Inf')} {count}")
+        lines.append(f"{STAGE_METRIC}_sum{_labels(stage=stage, language=language)} {total:.6f}")
+        lines.append(f"{STAGE_METRIC}_count{_labels(stage=stage, language=language)} {count}")
+    for name, metric_type, help_text, samples in extra:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples:
+            lines.append(f"{name}{_labels(**labels)} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,64 @@
+"""
+Nearest-neighbour search over one-syllable example words by phoneme edit distance.
+
+Example words are encoded once into a padded uint8 phoneme matrix. A query
+is first narrowed to candidates of similar length (preferring the same first
+phoneme), then the Levenshtein distance to every remaining candidate is
+computed at once with a row-by-row dynamic program over NumPy arrays.
+"""
+
+import numpy as np
+
+PAD = 0
+
+
+class PhoneticSearch:
+    def __init__(self, example_index, max_length_diff=1):
+        """`example_index` maps space-joined stress-stripped phonemes to an example word."""
+        self.max_length_diff = max_length_diff
+        self.symbol_ids = {}
+        self.words = list(example_index.values())
+        encoded = [self._encode(key.split()) for key in example_index]
+        width = max((len(e) for e in encoded), default=1)
+        self.matrix = np.full((len(encoded), width), PAD, dtype=np.uint8)
+        for row, ids in enumerate(encoded):
+            self.matrix[row, :len(ids)] = ids
+        self.lengths = np.fromiter((len(e) for e in encoded), dtype=np.int16, count=len(encoded))
+        self.first = self.matrix[:, 0].copy()
+
+    def _encode(self, phonemes):
+        return [self.symbol_ids.setdefault(p, len(self.symbol_ids) + 1) for p in phonemes]
+
+    def _candidates(self, query):
+        near = np.abs(self.lengths - len(query)) <= self.max_length_diff
+        same_first = near & (self.first == query[0])
+        return np.flatnonzero(same_first if same_first.any() else near)
+
+    def distances(self, query, rows):
+        """Levenshtein distance from `query` (phoneme ids) to each matrix row in `rows`."""
+        cand = self.matrix[rows]
+        k, width = cand.shape
+        prev = np.broadcast_to(np.arange(width + 1, dtype=np.int16), (k, width + 1)).copy()
+        cur = np.empty_like(prev)
+        for i, q in enumerate(query, start=1):
+            cur[:, 0] = i
+            substitution = prev[:, :-1] + (cand != q)
+            deletion = prev[:, 1:] + 1
+            step = np.minimum(substitution, deletion)
+            # Insertions depend on the cell to the left, so that part walks the columns
+            for j in range(1, width + 1):
+                cur[:, j] = np.minimum(step[:, j - 1], cur[:, j - 1] + 1)
+            prev, cur = cur, prev
+        return prev[np.arange(k), self.lengths[rows]]
+
+    def nearest(self, phonemes, max_distance=None):
+        """Closest example word for stress-stripped `phonemes`, or None if nothing is close enough."""
+        # Phonemes never seen in the lexicon get an id that matches nothing
+        query = [self.symbol_ids.get(p, 255) for p in phonemes]
+        if not query or not len(self.words): return None
+        rows = self._candidates(np.asarray(query, dtype=np.uint8))
+        if len(rows) == 0: return None
+        dist = self.distances(query, rows)
+        best = int(np.argmin(dist))
+        limit = max(1, len(query) // 2) if max_distance is None else max_distance
+        return self.words[rows[best]] if dist[best] <= limit else None
@@ -0,0 +1,66 @@
+"""
+In-process cache of serialized /breakdown responses.
+
+Entries are the final JSON bytes and their ETag, so a hit skips the
+breakdown, JSON encoding and hashing. The cache is bounded by the total size of
+the stored bodies and evicts least recently used entries first. It is
+only touched from the event loop, so it needs no lock.
+
+A hit bypasses the audio store, so it refreshes the clips the body links to
+there; otherwise the most requested words would be the first evicted.
+"""
+
+from collections import OrderedDict
+
+
+class ResponseCache:
+    def __init__(self, max_bytes, audio_cache):
+        self.max_bytes = max_bytes
+        self.audio_cache = audio_cache
+        # Larger bodies (mostly inline Base64 audio) would churn the whole cache
+        self.max_entry_bytes = max_bytes // 8
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> (body, etag, keys of the clips the body links to)
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+
+    def get(self, key):
+        """
+        Return the cached (body, etag), or None. Marks the linked clips as used in the
+        audio store; entries whose clips have been garbage-collected are dropped.
+        """
+        entry = self._entries.get(key)
+        if entry is None or not all(self.audio_cache.touch(clip) is not None for clip in entry[2]):
+            if entry is not None: self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0], entry[1]
+
+    def put(self, key, body, etag, audio_paths=()):
+        if self.max_bytes <= 0 or len(body) > self.max_entry_bytes: return
+        if key in self._entries: self._remove(key)
+        self._entries[key] = (body, etag, tuple(map(self.audio_cache.key_from_path, audio_paths)))
+        self._total_bytes += len(body)
+        while self._total_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        body, _, _ = self._entries.pop(key)
+        self._total_bytes -= len(body)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,60 @@
+"""
+G2P model that shares its large read-only state between processes.
+
+g2p_en's G2p keeps a private cmudict.dict() (the bulk of its memory) and
+loads its network weights from an .npz file. SharedG2p answers dictionary
+lookups from the memory-mapped lexicon snapshot and reads the weights from
+.npy files opened with mmap_mode='r', so every worker process maps the same
+pages instead of holding its own copy.
+"""
+
+import os
+import threading
+
+import numpy as np
+
+_WEIGHT_NAMES = ("enc_emb", "enc_w_ih", "enc_w_hh", "enc_b_ih", "enc_b_hh",
+                 "dec_emb", "dec_w_ih", "dec_w_hh", "dec_b_ih", "dec_b_hh", "fc_w", "fc_b")
+_construct_lock = threading.Lock()
+
+
+class _SnapshotCorpus:
+    """Stands in for nltk's cmudict reader while G2p is constructed."""
+
+    def __init__(self, lexicon):
+        self.lexicon = lexicon
+
+    def dict(self):
+        return self.lexicon.as_dict()
+
+
+def _export_weights(weights_dir):
+    import g2p_en.g2p as g2p_module
+    variables = np.load(os.path.join(g2p_module.dirname, "checkpoint20.npz"))
+    os.makedirs(weights_dir, exist_ok=True)
+    for name in _WEIGHT_NAMES:
+        # Workers exporting at the same time must not share a temp file
+        tmp_path = os.path.join(weights_dir, f"{name}.{os.getpid()}.{threading.get_ident()}.tmp.npy")
+        np.save(tmp_path, variables[name])
+        os.replace(tmp_path, os.path.join(weights_dir, f"{name}.npy"))
+
+
+def create_shared_g2p(lexicon, weights_dir):
+    import g2p_en.g2p as g2p_module
+
+    class SharedG2p(g2p_module.G2p):
+        def load_variables(self):
+            if not all(os.path.exists(os.path.join(weights_dir, f"{n}.npy")) for n in _WEIGHT_NAMES):
+                _export_weights(weights_dir)
+            for name in _WEIGHT_NAMES:
+                setattr(self, name, np.load(os.path.join(weights_dir, f"{name}.npy"), mmap_mode="r"))
+
+    # G2p.__init__ reads the module-level cmudict reader; point it at the snapshot
+    # for the duration of construction so the full dict is never materialized.
+    with _construct_lock:
+        original = g2p_module.cmudict
+        g2p_module.cmudict = _SnapshotCorpus(lexicon)
+        try:
+            return SharedG2p()
+        finally:
+            g2p_module.cmudict = original
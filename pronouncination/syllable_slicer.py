@@ -0,0 +1,105 @@
+"""
+Cut a synthesized word into syllable clips.
+
+Instead of one TTS request per syllable, the full word is synthesized once
+and split at low-energy points of the decoded PCM. The syllable count (and
+the relative length of each syllable's spelling) says how many cuts to make
+and roughly where; each cut then snaps to the quietest frame nearby.
+"""
+
+import io
+import wave
+
+import numpy as np
+
+FRAME_MS = 10
+# Frames quieter than this fraction of the peak frame count as silence
+SILENCE_RATIO = 0.08
+# How far (as a fraction of one average syllable) a cut may move from its expected position
+SEARCH_WINDOW = 0.4
+FADE_MS = 5
+
+
+def decode_audio(audio_bytes):
+    """Decode MP3 or 16-bit WAV bytes to mono int16 samples; returns (samples, sample_rate)."""
+    if audio_bytes[:4] == b"RIFF":
+        with wave.open(io.BytesIO(audio_bytes), "rb") as wf:
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+            channels = wf.getnchannels()
+            if channels > 1:
+                samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+            return samples, wf.getframerate()
+    import miniaudio
+    decoded = miniaudio.decode(audio_bytes, output_format=miniaudio.SampleFormat.SIGNED16, nchannels=1)
+    return np.frombuffer(decoded.samples, dtype=np.int16), decoded.sample_rate
+
+
+def encode_wav(samples, sample_rate):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(np.ascontiguousarray(samples, dtype=np.int16).tobytes())
+    return buf.getvalue()
+
+
+def frame_energy(samples, sample_rate, frame_ms=FRAME_MS):
+    """RMS energy per frame, computed for all frames at once."""
+    hop = max(1, sample_rate * frame_ms // 1000)
+    n_frames = len(samples) // hop
+    frames = samples[:n_frames * hop].astype(np.float32).reshape(n_frames, hop)
+    return np.sqrt(np.mean(frames * frames, axis=1)), hop
+
+
+def find_boundaries(samples, sample_rate, weights):
+    """
+    Return len(weights) + 1 sample offsets delimiting one segment per syllable.
+    `weights` are the expected relative durations of the syllables.
+    """
+    energy, hop = frame_energy(samples, sample_rate)
+    if len(energy) == 0:
+        return [0] * len(weights) + [len(samples)]
+    smooth = np.convolve(energy, np.ones(3, dtype=np.float32) / 3, mode="same")
+    voiced = np.flatnonzero(smooth > smooth.max() * SILENCE_RATIO)
+    if len(voiced) == 0:
+        start, end = 0, len(smooth)
+    else:
+        start, end = int(voiced[0]), int(voiced[-1]) + 1
+
+    weights = np.asarray(weights, dtype=np.float64)
+    span = end - start
+    expected = start + span * np.cumsum(weights)[:-1] / weights.sum()
+    half_window = max(1, int(span / len(weights) * SEARCH_WINDOW))
+
+    cuts, lowest = [], start + 1
+    for target in expected.astype(int).tolist():
+        lo = max(lowest, target - half_window)
+        hi = min(end - 1, target + half_window + 1)
+        cut = lo + int(np.argmin(smooth[lo:hi])) if hi > lo else min(max(lowest, target), end - 1)
+        cuts.append(cut)
+        lowest = cut + 1
+    return [start * hop] + [c * hop for c in cuts] + [min(end * hop, len(samples))]
+
+
+def slice_syllables(samples, sample_rate, weights):
+    """Split samples into one faded int16 segment per syllable."""
+    bounds = find_boundaries(samples, sample_rate, weights)
+    fade_len = sample_rate * FADE_MS // 1000
+    segments = []
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        segment = samples[a:b].astype(np.float32)
+        n = min(fade_len, len(segment) // 2)
+        if n:
+            ramp = np.linspace(0.0, 1.0, n, dtype=np.float32)
+            segment[:n] *= ramp
+            segment[-n:] *= ramp[::-1]
+        segments.append(segment.astype(np.int16))
+    return segments
+
+
+def slice_to_wavs(audio_bytes, syllables):
+    """Decode a full-word clip and return one WAV (bytes) per syllable."""
+    samples, sample_rate = decode_audio(audio_bytes)
+    weights = [max(1, len(s)) for s in syllables]
+    return [encode_wav(seg, sample_rate) for seg in slice_syllables(samples, sample_rate, weights)]
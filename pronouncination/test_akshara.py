@@ -0,0 +1,40 @@
+"""
+Akshara segmentation: conjuncts stay whole, signs attach to their base.
+
+    python -m pytest test_akshara.py
+"""
+
+import pytest
+
+from akshara import segment_aksharas
+
+
+@pytest.mark.parametrize("word, aksharas", [
+    # Conjuncts joined across a virama
+    ("स्व", ["स्व"]),
+    ("త్ర్య", ["త్ర్య"]),
+    ("स्वतंत्रता", ["स्व", "तं", "त्र", "ता"]),
+    ("స్వాతంత్ర్యం", ["స్వా", "తం", "త్ర్యం"]),
+    ("नमस्ते", ["न", "म", "स्ते"]),
+    ("అద్భుతం", ["అ", "ద్భు", "తం"]),
+    # Nuktas and vowel signs attach to their consonant
+    ("क़िला", ["क़ि", "ला"]),
+    ("ज़्यादा", ["ज़्या", "दा"]),
+    # Independent vowels start their own akshara
+    ("आओ", ["आ", "ओ"]),
+])
+def test_segments_words(word, aksharas):
+    assert segment_aksharas(word) == aksharas
+
+
+def test_segments_cover_the_whole_word():
+    for word in ["प्रौद्योगिकी", "ప్రజాస్వామ్యం", "र्‍य", "hello"]:
+        assert "".join(segment_aksharas(word)) == word
+
+
+def test_zero_width_joiner_keeps_the_cluster():
+    assert segment_aksharas("र्‍य") == ["र्‍य"]
+
+
+def test_empty_word():
+    assert segment_aksharas("") == []
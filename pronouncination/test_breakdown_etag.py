@@ -0,0 +1,119 @@
+"""
+/breakdown conditional requests: a response with missing clips must never be
+revalidated, so the complete result reaches the client once it exists.
+
+    python -m pytest test_breakdown_etag.py
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+os.environ.setdefault("TTS_BACKEND", "tone")
+os.environ.setdefault("TTS_FALLBACK_BACKEND", "")
+os.environ.setdefault("WARM_CACHES_ON_STARTUP", "false")
+os.environ.setdefault("PREWARM_RANDOM_WORDS", "false")
+
+from fastapi.testclient import TestClient
+
+import api
+from audio_cache import AudioCache
+
+
+def _result(full_audio_path, syllable_audio_path):
+    return {
+        "word": "hello",
+        "language": "english",
+        "full_audio_path": full_audio_path,
+        "syllables": [{"text": "hel", "audio_path": syllable_audio_path, "example_word_sound": "hell"}],
+    }
+
+
+@pytest.fixture
+def audio_cache(tmp_path, monkeypatch):
+    cache = AudioCache(str(tmp_path / "audio"), max_bytes=1024 * 1024, gc_interval=0)
+    monkeypatch.setattr(api.assistant, "audio_cache", cache)
+    monkeypatch.setattr(api, "response_cache", api.ResponseCache(1024 * 1024, cache))
+    return cache
+
+
+def _serve(monkeypatch, *results):
+    results = iter(results)
+
+    async def fake_breakdown(word, cpu_executor=None):
+        return next(results)
+
+    monkeypatch.setattr(api.assistant, "breakdown_word_async", fake_breakdown)
+    return TestClient(api.app)
+
+
+def test_partial_breakdown_then_conditional_request_returns_200(audio_cache, monkeypatch):
+    full_clip = audio_cache.put("hello", "en", "gtts", b"RIFF", "wav")
+    syllable_clip = audio_cache.put("hel", "en", "gtts", b"RIFF", "wav")
+    client = _serve(monkeypatch, _result(full_clip, None), _result(full_clip, syllable_clip))
+
+    partial = client.get("/breakdown", params={"word": "hello"})
+    assert partial.status_code == 200
+    assert "etag" not in partial.headers
+    assert partial.headers["cache-control"] == "no-store"
+
+    # Even a tag for the partial body must not revalidate it now that the clips exist
+    partial_etag = api._breakdown_etag(partial.content)
+    complete = client.get("/breakdown", params={"word": "hello"}, headers={"If-None-Match": partial_etag})
+    assert complete.status_code == 200
+    assert "audio_url" in complete.json()["syllables"][0]
+
+    revalidated = client.get("/breakdown", params={"word": "hello"}, headers={"If-None-Match": complete.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+def test_breakdown_does_not_expose_server_paths(audio_cache, monkeypatch):
+    clip = audio_cache.put("hello", "en", "gtts", b"RIFF", "wav")
+    response = _serve(monkeypatch, _result(clip, clip)).get("/breakdown", params={"word": "hello"})
+
+    assert response.status_code == 200
+    assert audio_cache.cache_dir not in response.text
+    assert "full_audio_path" not in response.json()
+    assert "audio_path" not in response.json()["syllables"][0]
+    assert response.json()["full_audio_url"].endswith("/audio/" + os.path.basename(clip))
+
+
+def test_response_cache_hits_keep_clips_alive(audio_cache, monkeypatch):
+    clip = audio_cache.put("hello", "en", "gtts", b"RIFF", "wav")
+    client = _serve(monkeypatch, _result(clip, clip))
+    assert client.get("/breakdown", params={"word": "hello"}).status_code == 200
+    idle = audio_cache.put("idle", "en", "gtts", b"RIFF", "wav")
+
+    assert client.get("/breakdown", params={"word": "hello"}).status_code == 200
+    assert api.response_cache.hits == 1
+    audio_cache.max_bytes = 4
+    audio_cache.collect()
+    assert os.path.exists(clip)
+    assert not os.path.exists(idle)
+
+
+def test_audio_fetches_keep_clips_alive(audio_cache):
+    clip = audio_cache.put("hello", "en", "gtts", b"RIFF", "wav")
+    idle = audio_cache.put("idle", "en", "gtts", b"RIFF", "wav")
+
+    response = TestClient(api.app).get(f"/audio/{os.path.basename(clip)}")
+    assert response.status_code == 200
+    audio_cache.max_bytes = 4
+    audio_cache.collect()
+    assert os.path.exists(clip)
+    assert not os.path.exists(idle)
+
+
+def test_inline_audio_carries_its_mime_type(audio_cache, monkeypatch):
+    full_clip = audio_cache.put("hello", "en", "gtts", b"ID3", "mp3")
+    syllable_clip = audio_cache.put("hel", "en", "espeak", b"RIFF", "wav")
+    response = _serve(monkeypatch, _result(full_clip, syllable_clip)).get(
+        "/breakdown", params={"word": "hello", "inline_audio": "true"}
+    )
+
+    assert response.json()["full_audio_mime_type"] == "audio/mpeg"
+    assert response.json()["syllables"][0]["audio_mime_type"] == "audio/wav"
+    assert response.json()["syllables"][0]["audio_base64"] == "UklGRg=="
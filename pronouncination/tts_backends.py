@@ -0,0 +1,147 @@
+"""
+Pluggable text-to-speech engines.
+
+Every backend turns (text, lang) into (audio_bytes, format) with a blocking
+`synthesize` and an awaitable `synthesize_async`. Which backend serves a
+language is configured in config.py; a network backend can be paired with
+an offline fallback that takes over when it fails or times out.
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import threading
+
+import numpy as np
+
+
+class TTSBackend:
+    name = "base"
+
+    def synthesize(self, text, lang):
+        raise NotImplementedError
+
+    async def synthesize_async(self, text, lang):
+        return await asyncio.to_thread(self.synthesize, text, lang)
+
+    async def aclose(self):
+        pass
+
+
+class GTTSBackend(TTSBackend):
+    """Google Translate TTS (network)."""
+    name = "gtts"
+
+    def __init__(self, timeout, max_connections):
+        from async_tts import AsyncGTTS
+        self.timeout = timeout
+        self._async_client = AsyncGTTS(timeout, max_connections)
+
+    def synthesize(self, text, lang):
+        from gtts import gTTS
+        buf = io.BytesIO()
+        gTTS(text=text, lang=lang, slow=False, timeout=self.timeout).write_to_fp(buf)
+        return buf.getvalue(), "mp3"
+
+    async def synthesize_async(self, text, lang):
+        return await self._async_client.synthesize(text, lang), "mp3"
+
+    async def aclose(self):
+        await self._async_client.aclose()
+
+
+class EspeakBackend(TTSBackend):
+    """Local offline synthesis with the espeak-ng (or espeak) command line tool."""
+    name = "espeak"
+    VOICES = {"en": "en-us", "hi": "hi", "te": "te"}
+
+    def __init__(self, timeout, max_processes=None):
+        self.timeout = timeout
+        self.executable = shutil.which("espeak-ng") or shutil.which("espeak")
+        # When the primary backend fails across the board every pending clip falls back
+        # at once; cap the espeak processes so that cannot fork-bomb the host
+        max_processes = max_processes or os.cpu_count() or 4
+        self._process_slots = threading.BoundedSemaphore(max_processes)
+        self._async_process_slots = asyncio.Semaphore(max_processes)
+
+    @property
+    def available(self):
+        return self.executable is not None
+
+    def _command(self, text, lang):
+        if not self.available:
+            raise RuntimeError("espeak-ng is not installed")
+        return [self.executable, "--stdout", "-v", self.VOICES.get(lang, lang), "--", text]
+
+    def synthesize(self, text, lang):
+        command = self._command(text, lang)
+        with self._process_slots:
+            out = subprocess.run(command, capture_output=True, timeout=self.timeout, check=True)
+        return out.stdout, "wav"
+
+    async def synthesize_async(self, text, lang):
+        command = self._command(text, lang)
+        async with self._async_process_slots:
+            proc = await asyncio.create_subprocess_exec(
+                *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=self.timeout)
+            finally:
+                # Timed out or cancelled by the caller's deadline: reap the child before
+                # giving up the slot, or it keeps running outside the process cap
+                if proc.returncode is None:
+                    try:
+                        proc.kill()
+                    except ProcessLookupError:
+                        pass
+                    await proc.wait()
+        if proc.returncode != 0:
+            raise RuntimeError(f"espeak failed: {stderr.decode(errors='replace').strip()}")
+        return stdout, "wav"
+
+
+class ToneBackend(TTSBackend):
+    """
+    Deterministic stand-in for tests and benchmarks: one two-formant tone
+    burst per pair of characters, pitched from a hash of the text.
+    """
+    name = "tone"
+    SAMPLE_RATE = 16000
+
+    def synthesize(self, text, lang):
+        import syllable_slicer
+        digest = hashlib.sha256(f"{lang}\0{text}".encode("utf-8")).digest()
+        sr = self.SAMPLE_RATE
+        burst = np.arange(int(sr * 0.12)) / sr
+        envelope = np.sin(np.pi * burst / burst[-1])
+        gap = np.zeros(int(sr * 0.03))
+        parts = [gap]
+        for i in range(max(1, (len(text) + 1) // 2)):
+            f1 = 300 + digest[i % len(digest)] * 2
+            f2 = 1200 + digest[(i + 7) % len(digest)] * 6
+            parts.append((np.sin(2 * np.pi * f1 * burst) + 0.5 * np.sin(2 * np.pi * f2 * burst)) * envelope * 8000)
+            parts.append(gap)
+        return syllable_slicer.encode_wav(np.concatenate(parts).astype(np.int16), sr), "wav"
+
+    async def synthesize_async(self, text, lang):
+        return self.synthesize(text, lang)
+
+
+def build_backend(name, timeout, max_connections):
+    if name == "gtts": return GTTSBackend(timeout, max_connections)
+    if name == "espeak": return EspeakBackend(timeout)
+    if name == "tone": return ToneBackend()
+    raise ValueError(f"Unknown TTS backend '{name}'")
+
+
+def parse_language_backends(spec):
+    """'te=espeak,hi=gtts' -> {'te': 'espeak', 'hi': 'gtts'}"""
+    mapping = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        lang, _, name = item.partition("=")
+        mapping[lang.strip()] = name.strip()
+    return mapping
@@ -0,0 +1,76 @@
+"""
+Process pool for the CPU-bound part of a breakdown (G2P and example-word lookups).
+
+Threads cannot run the G2P model in parallel because it holds the GIL.
+Each worker process builds a PronunciationAssistant without audio support.
+Its lexicon, G2P dictionary and model weights are memory-mapped from the
+shared snapshot (see lexicon_snapshot.py and shared_g2p.py), so adding
+workers adds little resident memory.
+
+Workers keep their own memo tables and latency histograms. Every task
+returns a snapshot of both, and the parent keeps the latest one per worker
+for /cache/stats and /metrics.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import metrics
+
+_assistant = None
+# Parent side: worker pid -> memo stats it reported last
+_worker_memo_stats = {}
+
+
+def _init_worker(warm_words=()):
+    global _assistant
+    from main import PronunciationAssistant
+    _assistant = PronunciationAssistant(with_audio=False)
+    _assistant.warm_up()
+    _assistant.warm_caches(warm_words)
+
+
+def _started():
+    return os.getpid()
+
+
+def example_words(components):
+    """Example words for `components`, plus this worker's pid, memo stats and histograms."""
+    words = _assistant._example_words('english', components)
+    return words, os.getpid(), _assistant.memo_stats(), metrics.snapshot()
+
+
+def record_stats(pid, memo_stats, histograms):
+    _worker_memo_stats[pid] = memo_stats
+    metrics.set_remote(pid, histograms)
+
+
+def memo_stats():
+    """Memo-table counters summed over every worker that has reported, e.g. {'g2p_workers': {...}}."""
+    totals = {}
+    for stats in list(_worker_memo_stats.values()):
+        for name, memo in stats.items():
+            total = totals.setdefault(f"{name}_workers", dict.fromkeys(("hits", "misses", "entries", "max_entries"), 0))
+            for field in total:
+                total[field] += memo[field]
+    for total in totals.values():
+        lookups = total["hits"] + total["misses"]
+        total["hit_ratio"] = round(total["hits"] / lookups, 4) if lookups else 0.0
+    return totals
+
+
+def create_pool(workers, assistant, warm_words=()):
+    """
+    Start `workers` processes, each pre-filling its memo tables with `warm_words`.
+    The parent's assistant builds the snapshot files first so the workers only
+    ever map them.
+    """
+    assistant.warm_up()
+    # spawn rather than fork: the parent already runs GC, TTS and event-loop threads
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_worker, initargs=(tuple(warm_words),))
+    # Workers start on demand; start them all now so their warm-up does not delay the first requests
+    for _ in range(workers):
+        pool.submit(_started)
+    return pool